@@ -0,0 +1,123 @@
+"""
+Chunk Shard Builder Script.
+
+Concatenates each persona's chunk files (datasets/<persona>/chunks/*.json)
+into a single gzipped JSON Lines shard, datasets/<persona>/chunks.jsonl.gz.
+While a shard is current (newer than every chunk file and built from the
+same number of them) the test fixtures read it instead of opening every
+chunk file, which turns thousands of open/close calls into one. Rebuild
+shards after changing the chunk files; otherwise they are ignored.
+
+Usage:
+    python build_shards.py                 # Build shards for all personas
+    python build_shards.py --persona du_fu # Build a single persona's shard
+    python build_shards.py --clean         # Remove existing shards
+"""
+
+import sys
+import gzip
+import json
+import argparse
+from pathlib import Path
+
+from personas import PERSONA_IDENTIFIERS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+SHARD_NAME = 'chunks.jsonl.gz'
+
+# Header key on the shard's first line: number of chunk files it was built
+# from (checked by the conftest all_chunks fixture)
+SHARD_HEADER_KEY = 'source_files'
+
+
+def _dumps_line(chunk):
+    """
+    Serialise one chunk as a UTF-8 JSON line.
+    
+    Args:
+        chunk: Chunk dictionary
+        
+    Returns:
+        bytes: Compact JSON followed by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps(chunk) + b'\n'
+    return json.dumps(chunk, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def build_shard(persona_dir):
+    """
+    Write the chunks.jsonl.gz shard for one persona.
+    
+    Args:
+        persona_dir: Path to datasets/<persona>
+        
+    Returns:
+        int: Number of chunks written, or None if there is no chunks/ directory
+    """
+    chunks_dir = persona_dir / 'chunks'
+    if not chunks_dir.is_dir():
+        return None
+    
+    chunk_files = sorted(chunks_dir.glob('*.json'))
+    chunk_count = 0
+    with gzip.open(persona_dir / SHARD_NAME, 'wb') as shard:
+        shard.write(_dumps_line({SHARD_HEADER_KEY: len(chunk_files)}))
+        for chunk_file in chunk_files:
+            chunks = json.loads(chunk_file.read_bytes())
+            for chunk in chunks:
+                shard.write(_dumps_line(chunk))
+            chunk_count += len(chunks)
+    return chunk_count
+
+
+def main():
+    """Main shard builder function."""
+    parser = argparse.ArgumentParser(
+        description="Build per-persona chunk shards for the test suite",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    
+    parser.add_argument(
+        '--persona', '-p',
+        choices=PERSONA_IDENTIFIERS,
+        help='Build the shard for a single persona'
+    )
+    
+    parser.add_argument(
+        '--clean',
+        action='store_true',
+        help='Remove existing shards instead of building them'
+    )
+    
+    args = parser.parse_args()
+    
+    datasets_dir = Path(__file__).resolve().parent.parent / 'datasets'
+    personas = [args.persona] if args.persona else PERSONA_IDENTIFIERS
+    
+    for persona in personas:
+        persona_dir = datasets_dir / persona
+        
+        if args.clean:
+            shard_path = persona_dir / SHARD_NAME
+            if shard_path.exists():
+                shard_path.unlink()
+                print(f"Removed: {shard_path}")
+            continue
+        
+        chunk_count = build_shard(persona_dir)
+        if chunk_count is None:
+            print(f"Skipped {persona}: no chunks directory")
+        else:
+            print(f"Built {persona_dir / SHARD_NAME}: {chunk_count} chunks")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,15 +5,249 @@ This module provides reusable fixtures and configuration for the test suite,
 following pytest best practices for NLP dataset validation.
 """
 
+import gzip
 import json
+import os
+import pickle
+from array import array
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+from personas import PERSONA_IDENTIFIERS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 
 # Test configuration
 pytest_plugins = []
 
+# Repository root; the dataset lives under datasets/
+DATASET_ROOT = Path(__file__).resolve().parent.parent
+
+# Directories skipped when indexing the dataset's JSON files (hidden
+# directories such as .git are skipped as well)
+WALK_IGNORE_DIRS = frozenset({
+    "__pycache__", "node_modules", "htmlcov", "venv",
+})
+
+# Threads used to read and parse JSON files in the session fixtures
+JSON_LOADER_WORKERS = 8
+
+# Files above this size are validated by streaming them through ijson (when
+# installed) instead of building the parsed object
+STREAM_VALIDATE_BYTES = 5 * 1024 * 1024
+
+# pytest cache entries holding the parsed chunk files between runs
+CHUNK_CACHE_DIR = "living_voices"
+CHUNK_CACHE_KEY = "living_voices/chunks_fingerprint"
+
+# Optional per-persona shard written by tests/build_shards.py; used in place
+# of the chunks/*.json files while it is current. Its first line is a header
+# recording how many chunk files it was built from
+CHUNK_SHARD_NAME = "chunks.jsonl.gz"
+CHUNK_SHARD_HEADER_KEY = "source_files"
+
+
+def _load_json(path: Path) -> Any:
+    """
+    Parse a JSON file straight from its raw bytes.
+    
+    Results are memoised per (path, mtime, size), so repeated pytest
+    sessions inside one interpreter (e.g. run_tests.py calling pytest.main)
+    only re-parse files that changed. Callers must not mutate the result.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    file_stat = path.stat()
+    return _load_json_cached(str(path), file_stat.st_mtime_ns, file_stat.st_size)
+
+
+@lru_cache(maxsize=None)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a JSON file, keyed by its path and on-disk version.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library json module otherwise.
+    
+    Args:
+        path: Path to the JSON file
+        mtime_ns: File modification time, part of the cache key
+        size: File size in bytes, part of the cache key
+        
+    Returns:
+        Parsed JSON data
+    """
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _validate_json(path: Path) -> None:
+    """
+    Check that a file parses as JSON without keeping the parsed data.
+    
+    Unlike _load_json the result is not memoised. Large files are streamed
+    through ijson when it is installed, so the object graph is never built;
+    otherwise the file is parsed and the result dropped immediately.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    if ijson is not None and path.stat().st_size > STREAM_VALIDATE_BYTES:
+        with open(path, 'rb') as f:
+            for _ in ijson.parse(f):
+                pass
+        return
+    
+    data = path.read_bytes()
+    if orjson is not None:
+        orjson.loads(data)
+    else:
+        json.loads(data)
+
+
+def _scan_json_files(directory: Path) -> Optional[List[Path]]:
+    """
+    List the JSON files directly inside a directory.
+    
+    Uses a single os.scandir pass (directory entries come back with their
+    file type) instead of Path.glob.
+    
+    Args:
+        directory: Directory to scan
+        
+    Returns:
+        list: Paths of the *.json files, or None if the directory is missing
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.json') and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return None
+
+
+def _load_chunk_file(path: Path) -> Any:
+    """
+    Parse a chunk source: a gzipped JSON Lines shard or a plain JSON file.
+    
+    Args:
+        path: Path to a chunks.jsonl.gz shard or a chunk JSON file
+        
+    Returns:
+        list: Chunk dictionaries
+    """
+    if not path.name.endswith('.jsonl.gz'):
+        return _load_json(path)
+    
+    loads = orjson.loads if orjson is not None else json.loads
+    with gzip.open(path, 'rb') as f:
+        f.readline()  # header line, see _shard_is_current
+        return [loads(line) for line in f if line.strip()]
+
+
+def _shard_is_current(shard: Path, chunk_files: List[Path]) -> bool:
+    """
+    Check whether a chunks.jsonl.gz shard still reflects the chunk files.
+    
+    The shard is current when it is at least as new as every chunk file and
+    its header records the same number of source files, so edited, added
+    or removed chunk files (or a shard without a header) are detected.
+    
+    Args:
+        shard: Path to the persona's chunks.jsonl.gz shard
+        chunk_files: Paths of the persona's chunks/*.json files
+        
+    Returns:
+        bool: True if the shard can be read instead of the chunk files
+    """
+    try:
+        shard_mtime = shard.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    
+    if any(chunk_file.stat().st_mtime_ns > shard_mtime for chunk_file in chunk_files):
+        return False
+    
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        with gzip.open(shard, 'rb') as f:
+            header = loads(f.readline())
+    except (OSError, ValueError):
+        return False
+    return isinstance(header, dict) and header.get(CHUNK_SHARD_HEADER_KEY) == len(chunk_files)
+
+
+def _load_json_files(paths: List[Path], loader=_load_json) -> List[Tuple[Path, Any]]:
+    """
+    Load several JSON files concurrently, keeping their input order.
+    
+    The work is dominated by file reads, which release the GIL, so a
+    small thread pool overlaps the I/O latency of the many chunk files.
+    
+    Args:
+        paths: JSON file paths
+        loader: Function parsing a single path
+        
+    Returns:
+        list: (path, parsed_data) pairs in the order of paths
+    """
+    with ThreadPoolExecutor(max_workers=JSON_LOADER_WORKERS) as executor:
+        return list(zip(paths, executor.map(loader, paths)))
+
+
+@lru_cache(maxsize=None)
+def _index_json_files(root: str) -> Dict[str, Any]:
+    """
+    Walk a directory tree once with os.walk, collecting its JSON files.
+    
+    Tool and cache directories (WALK_IGNORE_DIRS, and any hidden directory)
+    are pruned before they are descended into. Cached per root so test
+    collection (pytest_generate_tests) and the json_file_index fixture
+    share a single walk.
+    
+    Args:
+        root: Directory to walk
+        
+    Returns:
+        dict: {"all": [Path, ...], "by_dir": {str(directory): [Path, ...]}}
+    """
+    index = {"all": [], "by_dir": {}}
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            name for name in dirnames
+            if name not in WALK_IGNORE_DIRS and not name.startswith('.')
+        ]
+        for filename in filenames:
+            if filename.endswith('.json'):
+                json_path = Path(directory, filename)
+                index["all"].append(json_path)
+                index["by_dir"].setdefault(directory, []).append(json_path)
+    return index
+
 
 @pytest.fixture(scope="session")
 def dataset_root() -> Path:
@@ -23,10 +257,7 @@ def dataset_root() -> Path:
     Returns:
         Path: Absolute path to dataset root
     """
-    current_file = Path(__file__).resolve()
-    tests_dir = current_file.parent
-    dataset_root_path = tests_dir.parent
-    return dataset_root_path
+    return DATASET_ROOT
 
 
 @pytest.fixture(scope="session")
@@ -82,8 +313,55 @@ def statistics_data(statistics_file: Path) -> Dict[str, Any]:
     Returns:
         dict: Parsed statistics data
     """
-    with open(statistics_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_json(statistics_file)
+
+
+@pytest.fixture(scope="session")
+def distribution(statistics_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fixture providing the distribution section of the statistics data.
+    
+    Args:
+        statistics_data: Loaded statistics data fixture
+        
+    Returns:
+        dict: Distribution breakdowns (empty if the section is missing)
+    """
+    return statistics_data.get("distribution", {})
+
+
+@pytest.fixture(scope="session")
+def persona_rows(statistics_data: Dict[str, Any]) -> List[Tuple]:
+    """
+    Fixture providing each persona's statistics sections, looked up once.
+    
+    Args:
+        statistics_data: Loaded statistics data fixture
+        
+    Returns:
+        list: (persona_id, persona, documents, chunks, content) tuples, one
+        per persona in statistics.json
+    """
+    return [
+        (persona_id, persona, persona["documents"], persona["chunks"], persona["content"])
+        for persona_id, persona in statistics_data["personas"].items()
+    ]
+
+
+@pytest.fixture(scope="session")
+def statistics_first_bytes(statistics_file: Path) -> bytes:
+    """
+    Fixture providing the first three bytes of statistics.json, enough to
+    detect a UTF-8 byte order mark.
+    
+    Args:
+        statistics_file: Statistics file path fixture
+        
+    Returns:
+        bytes: Leading bytes of the file
+    """
+    with open(statistics_file, 'rb') as f:
+        return f.read(3)
 
 
 @pytest.fixture(scope="session")
@@ -94,7 +372,27 @@ def persona_identifiers() -> List[str]:
     Returns:
         list: Persona identifier strings
     """
-    return ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+    return list(PERSONA_IDENTIFIERS)
+
+
+@pytest.fixture
+def persona_record(request: pytest.FixtureRequest,
+                   statistics_data: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Fixture providing one persona's statistics entry.
+    
+    Parametrized indirectly over PERSONA_IDENTIFIERS by pytest_generate_tests,
+    so each persona runs (and is reported) as its own test item.
+    
+    Args:
+        request: Pytest fixture request carrying the persona ID as param
+        statistics_data: Loaded statistics data fixture
+        
+    Returns:
+        tuple: (persona_id, persona entry or None if it is missing)
+    """
+    persona_id = request.param
+    return persona_id, statistics_data.get("personas", {}).get(persona_id)
 
 
 @pytest.fixture(scope="session")
@@ -175,7 +473,333 @@ def iso_language_codes() -> Dict[str, str]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def root_entries(dataset_root: Path) -> Dict[str, os.DirEntry]:
+    """
+    Fixture providing the entries of the dataset root directory, read with
+    a single os.scandir call.
+    
+    Args:
+        dataset_root: Root directory fixture
+        
+    Returns:
+        dict: Mapping of entry name -> os.DirEntry
+    """
+    with os.scandir(dataset_root) as entries:
+        return {entry.name: entry for entry in entries}
+
+
+@pytest.fixture(scope="session")
+def readme_bytes(dataset_root: Path) -> bytes:
+    """
+    Fixture providing the raw bytes of the main README.md, read once.
+    
+    Substring checks can run on the bytes directly, skipping a UTF-8 decode.
+    
+    Args:
+        dataset_root: Root directory fixture
+        
+    Returns:
+        bytes: README.md contents
+    """
+    return (dataset_root / "README.md").read_bytes()
+
+
+@pytest.fixture(scope="session")
+def json_file_index(dataset_root: Path) -> Dict[str, Any]:
+    """
+    Fixture providing every *.json file under the dataset root, found in a
+    single pruned os.walk per session.
+    
+    Args:
+        dataset_root: Root directory fixture
+        
+    Returns:
+        dict: {"all": [Path, ...], "by_dir": {str(directory): [Path, ...]}}
+    """
+    return _index_json_files(str(dataset_root))
+
+
+@pytest.fixture(scope="session")
+def validate_json():
+    """
+    Fixture providing a validation-only JSON parser.
+    
+    For tests that only need to know a file parses; nothing is cached, so
+    peak memory stays at one file.
+    
+    Returns:
+        callable: Function raising if a file path is not valid JSON
+    """
+    return _validate_json
+
+
+@pytest.fixture(scope="session")
+def loaded_json():
+    """
+    Fixture providing a memoising JSON loader shared by the whole session.
+    
+    Each file is parsed once per session however many tests read it; the
+    returned data is shared, so tests must treat it as read-only.
+    
+    Returns:
+        callable: Function mapping a file path to its parsed JSON data
+    """
+    cache = {}
+
+    def load(path) -> Any:
+        key = Path(path).resolve()
+        if key not in cache:
+            cache[key] = _load_json(key)
+        return cache[key]
+    
+    return load
+
+
+@pytest.fixture(scope="session")
+def all_chunks(datasets_dir: Path, persona_identifiers: List[str],
+               pytestconfig) -> Dict[str, List[Tuple[Path, Any]]]:
+    """
+    Fixture providing every persona's chunk files, parsed once per session.
+    
+    A persona's chunks.jsonl.gz shard is read instead of its chunks/*.json
+    files while it is current (see _shard_is_current); personas without a
+    chunks directory are left out of the mapping. The parsed chunks are also pickled into the pytest cache together with a
+    fingerprint of every file's path, size and mtime, so later runs skip
+    JSON parsing entirely while the chunk files are unchanged.
+    
+    Args:
+        datasets_dir: Datasets directory fixture
+        persona_identifiers: List of persona IDs
+        pytestconfig: pytest config object (provides the cache)
+        
+    Returns:
+        dict: Mapping of persona_id -> list of (chunk_file, chunks) pairs
+    """
+    chunk_files_by_persona = {}
+    for persona_id in persona_identifiers:
+        chunk_files = _scan_json_files(datasets_dir / persona_id / "chunks")
+        if chunk_files is None:
+            continue
+        shard = datasets_dir / persona_id / CHUNK_SHARD_NAME
+        if _shard_is_current(shard, chunk_files):
+            chunk_files = [shard]
+        chunk_files_by_persona[persona_id] = chunk_files
+    
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is None:
+        return {
+            persona_id: _load_json_files(chunk_files, _load_chunk_file)
+            for persona_id, chunk_files in chunk_files_by_persona.items()
+        }
+    
+    fingerprint = []
+    for persona_id, chunk_files in chunk_files_by_persona.items():
+        for chunk_file in chunk_files:
+            file_stat = chunk_file.stat()
+            fingerprint.append([persona_id, str(chunk_file), file_stat.st_size, file_stat.st_mtime_ns])
+    
+    try:
+        pickle_path = cache.mkdir(CHUNK_CACHE_DIR) / "chunks.pkl"
+    except OSError:
+        pickle_path = None
+    if (pickle_path is not None and cache.get(CHUNK_CACHE_KEY, None) == fingerprint
+            and pickle_path.exists()):
+        try:
+            return pickle.loads(pickle_path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass
+    
+    chunks_by_persona = {
+        persona_id: _load_json_files(chunk_files, _load_chunk_file)
+        for persona_id, chunk_files in chunk_files_by_persona.items()
+    }
+    
+    # Write then rename, so concurrent (xdist) workers never read a partial
+    # pickle; an unwritable cache only costs the speed-up
+    if pickle_path is not None:
+        tmp_path = pickle_path.with_name(f"{pickle_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(pickle.dumps(chunks_by_persona, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp_path, pickle_path)
+        except OSError:
+            pass
+        else:
+            cache.set(CHUNK_CACHE_KEY, fingerprint)
+    return chunks_by_persona
+
+
+@pytest.fixture(scope="session")
+def chunk_summary(all_chunks: Dict[str, List[Tuple[Path, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fixture providing per-persona chunk quality facts gathered in one pass.
+    
+    Sizes are measured in characters for Du Fu (Classical Chinese) and in
+    words for the English personas, and are kept in a compact int64 array
+    so range and average checks reduce with C-level min/max/sum.
+    
+    Args:
+        all_chunks: Parsed chunk files fixture
+        
+    Returns:
+        dict: Mapping of persona_id -> summary with keys file_count,
+            sizes (array of int64), size_files [file_name per size],
+            empty [chunk paths], chunk_ids [chunk_id],
+            dup_ids [chunk_id seen more than once],
+            missing_fields [(file_name, index, [field])] and
+            bad_metadata [(file_name, problem)]
+    """
+    required_fields = frozenset(('chunk_id', 'chunk_text', 'chunk_metadata'))
+    summary = {}
+    
+    for persona_id, chunk_files in all_chunks.items():
+        count_chars = persona_id == "du_fu"
+        sizes = array('q')
+        size_files = []
+        empty = []
+        chunk_ids = []
+        missing_fields = []
+        bad_metadata = []
+        
+        for chunk_file, chunks in chunk_files:
+            file_name = chunk_file.name
+            for idx, chunk in enumerate(chunks):
+                content = chunk.get('chunk_text', '')
+                chunk_ids.append(chunk.get('chunk_id'))
+                
+                # split() is the cheapest exact word count; an English chunk
+                # with no words is whitespace-only, so the same count doubles
+                # as the empty check. isspace() avoids a strip() copy.
+                if count_chars:
+                    size = len(content)
+                    is_empty = not content or content.isspace()
+                else:
+                    size = len(content.split())
+                    is_empty = size == 0
+                
+                if is_empty:
+                    empty.append(f"{persona_id}/{file_name}/{chunk.get('chunk_id', 'unknown')}")
+                sizes.append(size)
+                size_files.append(file_name)
+                
+                if not required_fields <= chunk.keys():
+                    missing_fields.append((file_name, idx, sorted(required_fields - chunk.keys())))
+                
+                metadata = chunk.get('chunk_metadata', {})
+                if not isinstance(metadata, dict):
+                    bad_metadata.append((file_name, "chunk_metadata must be dict"))
+                elif metadata and 'source_doc_id' not in metadata and 'doc_id' not in metadata:
+                    bad_metadata.append((file_name, "Missing source document reference"))
+        
+        summary[persona_id] = {
+            "file_count": len(chunk_files),
+            "sizes": sizes,
+            "size_files": size_files,
+            "empty": empty,
+            "chunk_ids": chunk_ids,
+            "dup_ids": [chunk_id for chunk_id, count in Counter(chunk_ids).items() if count > 1],
+            "missing_fields": missing_fields,
+            "bad_metadata": bad_metadata
+        }
+    return summary
+
+
+@pytest.fixture(scope="session")
+def all_documents(datasets_dir: Path, persona_identifiers: List[str]) -> Dict[str, List[Tuple[Path, Any]]]:
+    """
+    Fixture providing every persona's processed_data JSON files, parsed once
+    per session.
+    
+    Personas without a processed_data/ directory are left out of the mapping.
+    
+    Args:
+        datasets_dir: Datasets directory fixture
+        persona_identifiers: List of persona IDs
+        
+    Returns:
+        dict: Mapping of persona_id -> list of (json_file, data) pairs
+    """
+    documents_by_persona = {}
+    for persona_id in persona_identifiers:
+        doc_files = _scan_json_files(datasets_dir / persona_id / "processed_data")
+        if doc_files is not None:
+            documents_by_persona[persona_id] = _load_json_files(doc_files)
+    return documents_by_persona
+
+
+@pytest.fixture(scope="session")
+def document_ids(all_documents: Dict[str, List[Tuple[Path, Any]]]) -> Dict[str, frozenset]:
+    """
+    Fixture providing the set of document IDs found in each persona's
+    processed_data files.
+    
+    A document's ID is its 'id' field, falling back to 'doc_id'; documents
+    with neither are ignored. IDs are stored as strings.
+    
+    Args:
+        all_documents: Parsed processed_data files fixture
+        
+    Returns:
+        dict: Mapping of persona_id -> frozenset of document IDs
+    """
+    ids_by_persona = {}
+    for persona_id, doc_files in all_documents.items():
+        doc_ids = set()
+        for _, doc_data in doc_files:
+            docs = doc_data if isinstance(doc_data, list) else [doc_data]
+            for doc in docs:
+                doc_id = doc.get('id') or doc.get('doc_id')
+                if doc_id:
+                    doc_ids.add(str(doc_id))
+        ids_by_persona[persona_id] = frozenset(doc_ids)
+    return ids_by_persona
+
+
+@pytest.fixture(scope="session")
+def persona_layout(datasets_dir: Path, persona_identifiers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fixture describing the on-disk layout of each persona directory.
+    
+    Built from one os.scandir per directory (persona, processed_data and
+    metadata), so the file-presence tests make no filesystem calls.
+    
+    Args:
+        datasets_dir: Datasets directory fixture
+        persona_identifiers: List of persona IDs
+        
+    Returns:
+        dict: Mapping of persona_id -> {"subdirs", "has_processed",
+        "processed_json", "has_chunks", "training_chunks", "has_metadata",
+        "metadata_json"}
+    """
+    layout = {}
+    for persona_id in persona_identifiers:
+        persona_dir = datasets_dir / persona_id
+        try:
+            with os.scandir(persona_dir) as entries:
+                subdirs = frozenset(entry.name for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            subdirs = frozenset()
+        
+        processed_json = _scan_json_files(persona_dir / "processed_data")
+        metadata_json = _scan_json_files(persona_dir / "metadata")
+        training_chunks = next(
+            (path for path in processed_json or [] if path.name == "training_chunks.json"),
+            None
+        )
+        layout[persona_id] = {
+            "subdirs": subdirs,
+            "has_processed": processed_json is not None,
+            "processed_json": processed_json or [],
+            "has_chunks": training_chunks is not None,
+            "training_chunks": training_chunks,
+            "has_metadata": metadata_json is not None,
+            "metadata_json": metadata_json or [],
+        }
+    return layout
+
+
+@pytest.fixture(scope="session")
 def sample_chunk_schema() -> Dict[str, Any]:
     """
     Fixture providing example chunk schema for validation.
@@ -199,7 +823,7 @@ def sample_chunk_schema() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def persona_directories(datasets_dir: Path, persona_identifiers: List[str]) -> Dict[str, Path]:
     """
     Fixture providing paths to persona-specific directories.
@@ -217,6 +841,25 @@ def persona_directories(datasets_dir: Path, persona_identifiers: List[str]) -> D
     }
 
 
+def pytest_addoption(parser):
+    """
+    pytest hook to register command-line options.
+    
+    Adds --runslow; without it (or an explicit -m expression naming slow)
+    tests marked slow are deselected. Adds --fast, which makes count checks
+    use the totals recorded in statistics.json instead of re-reading the
+    processed data.
+    """
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="run tests marked slow"
+    )
+    parser.addoption(
+        "--fast", action="store_true", default=False,
+        help="trust statistics.json counts instead of recounting documents"
+    )
+
+
 def pytest_configure(config):
     """
     pytest configuration hook.
@@ -243,6 +886,38 @@ def pytest_configure(config):
     )
 
 
+def pytest_generate_tests(metafunc):
+    """
+    pytest hook to parametrize tests at collection time.
+    
+    Tests requesting a json_file argument run once per JSON file in the
+    dataset, so each file is reported (and scheduled) as its own item.
+    Tests requesting persona_sample run once per persona with a
+    (persona, sample_file) pair, sample_file being the persona's first
+    processed_data JSON file (None if it has none). Tests requesting
+    persona_record run once per persona ID, the fixture resolving the
+    persona's statistics entry.
+    """
+    if "json_file" in metafunc.fixturenames:
+        json_files = sorted(_index_json_files(str(DATASET_ROOT))["all"])
+        metafunc.parametrize(
+            "json_file", json_files,
+            ids=[str(path.relative_to(DATASET_ROOT)) for path in json_files]
+        )
+    
+    if "persona_sample" in metafunc.fixturenames:
+        by_dir = _index_json_files(str(DATASET_ROOT))["by_dir"]
+        samples = []
+        for persona in PERSONA_IDENTIFIERS:
+            processed_dir = DATASET_ROOT / "datasets" / persona / "processed_data"
+            processed_files = by_dir.get(str(processed_dir), [])
+            samples.append((persona, processed_files[0] if processed_files else None))
+        metafunc.parametrize("persona_sample", samples, ids=PERSONA_IDENTIFIERS)
+    
+    if "persona_record" in metafunc.fixturenames:
+        metafunc.parametrize("persona_record", PERSONA_IDENTIFIERS, indirect=True)
+
+
 def pytest_collection_modifyitems(config, items):
     """
     pytest hook to modify test collection.
@@ -253,3 +928,15 @@ def pytest_collection_modifyitems(config, items):
         # Mark tests that iterate over all files as potentially slow
         if "all_json" in item.nodeid or "all_chunks" in item.nodeid:
             item.add_marker(pytest.mark.slow)
+    
+    # Slow tests are opt-in: --runslow or a -m expression mentioning slow
+    if config.getoption("--runslow") or "slow" in (config.getoption("-m") or ""):
+        return
+    
+    selected, deselected = [], []
+    for item in items:
+        (deselected if item.get_closest_marker("slow") else selected).append(item)
+    
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
@@ -0,0 +1,12 @@
+"""
+Persona identifiers shared by the test suite and its helper scripts.
+
+Each persona has one directory under datasets/. Test modules, conftest.py
+and build_shards.py import these lists rather than repeating them.
+"""
+
+# Persona identifiers, one directory each under datasets/
+PERSONA_IDENTIFIERS = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+
+# Modern personas, whose content is in English
+MODERN_PERSONA_IDENTIFIERS = ["elon_musk", "queen_elizabeth_ii"]
@@ -7,8 +7,9 @@ Dataset test suite with various options and configurations.
 Usage:
     python run_tests.py                    # Run all tests
     python run_tests.py --coverage         # Run with coverage report
-    python run_tests.py --fast             # Skip slow tests
+    python run_tests.py --fast             # Skip slow tests, trust statistics.json counts
     python run_tests.py --module integrity # Run specific module
+    python run_tests.py --parallel auto    # Spread tests over CPU cores (pytest-xdist)
 """
 
 import sys
@@ -44,6 +45,39 @@ def run_command(cmd, description):
         return False
 
 
+def run_pytest_in_process(pytest_args, description):
+    """
+    Run pytest inside the current interpreter.
+    
+    Avoids the interpreter start-up and plugin discovery cost of a
+    pytest subprocess.
+    
+    Args:
+        pytest_args: Arguments to pass to pytest (without the program name)
+        description: Human-readable description of the run
+        
+    Returns:
+        bool: True if all tests passed, False otherwise
+    """
+    print(f"\n{'=' * 60}")
+    print(f"Running: {description}")
+    print(f"{'=' * 60}\n")
+    
+    try:
+        import pytest
+    except ImportError:
+        print(f"\nError: pytest not found. Please install with: pip install pytest")
+        return False
+    
+    exit_code = pytest.main(pytest_args)
+    if exit_code == 0:
+        print(f"\n{description} completed successfully.")
+        return True
+    
+    print(f"\nError: {description} failed with exit code {int(exit_code)}")
+    return False
+
+
 def main():
     """Main test runner function."""
     parser = argparse.ArgumentParser(
@@ -60,7 +94,7 @@ def main():
     parser.add_argument(
         '--fast',
         action='store_true',
-        help='Skip slow tests (marked with @pytest.mark.slow)'
+        help='Skip slow tests (marked with @pytest.mark.slow) and trust statistics.json counts'
     )
     
     parser.add_argument(
@@ -73,7 +107,13 @@ def main():
     parser.add_argument(
         '--module', '-m',
         choices=['integrity', 'schema', 'statistics', 'quality', 'completeness'],
-        help='Run specific test module'
+        help='Run one test category (selected by its pytest marker)'
+    )
+    
+    parser.add_argument(
+        '--parallel', '-n',
+        metavar='WORKERS',
+        help="Run tests on pytest-xdist workers ('auto' for one per core)"
     )
     
     parser.add_argument(
@@ -104,26 +144,36 @@ def main():
     if args.coverage:
         cmd.extend([
             '--cov=datasets',
+            f"--cov-config={tests_dir / '.coveragerc'}",
             '--cov-report=term-missing'
         ])
         
         if args.html_report:
             cmd.append('--cov-report=html')
     
-    # Skip slow tests if requested
+    # Select tests by marker; every test class carries its module's
+    # category marker, so one expression covers --fast and --module
+    marker_filters = []
+    
+    # Skip slow tests if requested; they are opt-in for plain pytest runs
     if args.fast:
-        cmd.extend(['-m', 'not slow'])
+        marker_filters.append('not slow')
+        cmd.append('--fast')
+    else:
+        cmd.append('--runslow')
     
     # Run specific module
     if args.module:
-        module_map = {
-            'integrity': 'test_data_integrity.py',
-            'schema': 'test_metadata_schema.py',
-            'statistics': 'test_statistics_accuracy.py',
-            'quality': 'test_chunk_quality.py',
-            'completeness': 'test_data_completeness.py'
-        }
-        cmd.append(str(tests_dir / module_map[args.module]))
+        marker_filters.append(args.module)
+    
+    if marker_filters:
+        cmd.extend(['-m', ' and '.join(marker_filters)])
+    
+    # Distribute tests over xdist workers; 'load' scheduling hands out
+    # individual items, so the per-file JSON parse cases spread across
+    # all workers rather than staying with their module
+    if args.parallel:
+        cmd.extend(['-n', args.parallel, '--dist=load'])
     
     # Add JSON report
     if args.json_report:
@@ -132,8 +182,12 @@ def main():
             '--json-report-file=test_results.json'
         ])
     
-    # Run tests
-    success = run_command(cmd, "Test Suite Execution")
+    # Run tests; coverage runs keep a separate pytest process so that
+    # measurement starts before any dataset code is imported
+    if args.coverage:
+        success = run_command(cmd, "Test Suite Execution")
+    else:
+        success = run_pytest_in_process(cmd[1:], "Test Suite Execution")
     
     # Print summary
     print(f"\n{'=' * 60}")
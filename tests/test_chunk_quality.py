@@ -6,16 +6,38 @@ size constraints, empty content detection, and persona-specific chunking
 strategies.
 """
 
-import json
+import warnings
 import pytest
 from pathlib import Path
 from typing import Dict, List
 
+from personas import MODERN_PERSONA_IDENTIFIERS, PERSONA_IDENTIFIERS
 
+
+def _persona_entry(by_persona, persona):
+    """
+    Return a persona's entry from a per-persona fixture mapping.
+    
+    Skips the calling test when the persona has no chunks directory.
+    
+    Args:
+        by_persona: Mapping of persona_id -> fixture data
+        persona: Persona identifier
+        
+    Returns:
+        The persona's fixture data
+    """
+    if persona not in by_persona:
+        pytest.skip(f"Chunks directory not found for {persona}")
+    return by_persona[persona]
+
+
+@pytest.mark.quality
 class TestChunkSizeValidation:
     """Test suite for validating chunk size distributions."""
 
-    def test_chunk_sizes_within_reasonable_range(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_sizes_within_reasonable_range(self, chunk_summary, persona):
         """
         Test that all chunks fall within expected size ranges.
         
@@ -24,319 +46,168 @@ class TestChunkSizeValidation:
         - Elon Musk: 50-1000 words (English)
         - Queen Elizabeth II: 50-1000 words (English)
         """
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                pytest.skip(f"Chunks directory not found for {persona}")
-            
-            chunk_files = list(chunks_dir.glob("*.json"))
-            assert len(chunk_files) > 0, f"No chunk files found for {persona}"
-            
-            for chunk_file in chunk_files:
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    content = chunk.get('chunk_text', '')
-                    
-                    # Check content is not empty
-                    assert len(content.strip()) > 0, \
-                        f"Empty chunk found in {chunk_file.name}"
-                    
-                    # Check reasonable size ranges
-                    if persona == "du_fu":
-                        # Classical Chinese: character-based
-                        char_count = len(content)
-                        assert 10 <= char_count <= 1000, \
-                            f"Chunk size {char_count} chars out of range in {chunk_file.name}"
-                    else:
-                        # English: word-based
-                        word_count = len(content.split())
-                        assert 10 <= word_count <= 1500, \
-                            f"Chunk size {word_count} words out of range in {chunk_file.name}"
-
-    def test_chunks_have_required_fields(self, dataset_root):
+        summary = _persona_entry(chunk_summary, persona)
+        assert summary["file_count"] > 0, f"No chunk files found for {persona}"
+        
+        # Check content is not empty
+        assert not summary["empty"], \
+            f"Empty chunk found in {summary['empty'][0]}"
+        
+        # Check reasonable size ranges: characters for Classical
+        # Chinese, words for English
+        if persona == "du_fu":
+            low, high, unit = 10, 1000, "chars"
+        else:
+            low, high, unit = 10, 1500, "words"
+        
+        sizes = summary["sizes"]
+        if sizes and (min(sizes) < low or max(sizes) > high):
+            idx = next(i for i, size in enumerate(sizes) if not low <= size <= high)
+            pytest.fail(
+                f"Chunk size {sizes[idx]} {unit} out of range in {summary['size_files'][idx]}"
+            )
+
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunks_have_required_fields(self, chunk_summary, persona):
         """Test that all chunks contain required fields."""
-        required_fields = ['chunk_id', 'chunk_text', 'chunk_metadata']
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for idx, chunk in enumerate(chunks):
-                    for field in required_fields:
-                        assert field in chunk, \
-                            f"Missing field '{field}' in chunk {idx} of {chunk_file.name}"
+        missing = _persona_entry(chunk_summary, persona)["missing_fields"]
+        if missing:
+            file_name, idx, fields = missing[0]
+            pytest.fail(f"Missing fields {fields} in chunk {idx} of {file_name}")
 
-    def test_chunk_metadata_structure(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_metadata_structure(self, chunk_summary, persona):
         """Test that chunk metadata has consistent structure."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    metadata = chunk.get('chunk_metadata', {})
-                    
-                    # Verify metadata is a dictionary
-                    assert isinstance(metadata, dict), \
-                        f"chunk_metadata must be dict in {chunk_file.name}"
-                    
-                    # Check for expected metadata fields
-                    if metadata:
-                        assert 'source_doc_id' in metadata or 'doc_id' in metadata, \
-                            f"Missing source document reference in {chunk_file.name}"
+        bad_metadata = _persona_entry(chunk_summary, persona)["bad_metadata"]
+        if bad_metadata:
+            file_name, problem = bad_metadata[0]
+            pytest.fail(f"{problem} in {file_name}")
 
 
+@pytest.mark.quality
 class TestEmptyChunkDetection:
     """Test suite for detecting empty or malformed chunks."""
 
-    def test_no_empty_chunks(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_no_empty_chunks(self, chunk_summary, persona):
         """Test that no chunks contain only whitespace."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        empty_chunks = []
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    content = chunk.get('chunk_text', '').strip()
-                    if not content:
-                        empty_chunks.append(f"{persona}/{chunk_file.name}/{chunk.get('chunk_id', 'unknown')}")
+        empty_chunks = _persona_entry(chunk_summary, persona)["empty"]
         
         assert len(empty_chunks) == 0, \
             f"Found {len(empty_chunks)} empty chunks: {empty_chunks[:5]}"
 
-    def test_no_duplicate_chunk_ids(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_no_duplicate_chunk_ids(self, chunk_summary, persona):
         """Test that chunk IDs are unique within each persona."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            chunk_ids = set()
-            duplicates = []
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    chunk_id = chunk.get('chunk_id')
-                    if chunk_id in chunk_ids:
-                        duplicates.append(chunk_id)
-                    chunk_ids.add(chunk_id)
-            
-            assert len(duplicates) == 0, \
-                f"Found {len(duplicates)} duplicate chunk IDs in {persona}: {duplicates[:5]}"
+        duplicates = _persona_entry(chunk_summary, persona)["dup_ids"]
+        assert len(duplicates) == 0, \
+            f"Found {len(duplicates)} duplicate chunk IDs in {persona}: {duplicates[:5]}"
 
 
+@pytest.mark.quality
 class TestPersonaSpecificChunking:
     """Test suite for validating persona-specific chunking strategies."""
 
-    def test_dufu_character_based_chunking(self, dataset_root):
+    def test_dufu_character_based_chunking(self, chunk_summary):
         """Test that Du Fu chunks are appropriately sized for Classical Chinese."""
-        chunks_dir = dataset_root / "datasets" / "du_fu" / "chunks"
-        
-        if not chunks_dir.exists():
-            pytest.skip("Du Fu chunks directory not found")
-        
-        total_chars = 0
-        chunk_count = 0
-        
-        for chunk_file in chunks_dir.glob("*.json"):
-            with open(chunk_file, 'r', encoding='utf-8') as f:
-                chunks = json.load(f)
-            
-            for chunk in chunks:
-                content = chunk.get('chunk_text', '')
-                char_count = len(content)
-                total_chars += char_count
-                chunk_count += 1
+        sizes = _persona_entry(chunk_summary, "du_fu")["sizes"]
         
         # Average chunk size should be reasonable for Classical Chinese
-        if chunk_count > 0:
-            avg_chars = total_chars / chunk_count
+        if sizes:
+            avg_chars = sum(sizes) / len(sizes)
             assert 50 <= avg_chars <= 600, \
                 f"Average Du Fu chunk size {avg_chars:.1f} chars is outside expected range"
 
-    def test_english_personas_word_based_chunking(self, dataset_root):
+    @pytest.mark.parametrize("persona", MODERN_PERSONA_IDENTIFIERS)
+    def test_english_personas_word_based_chunking(self, chunk_summary, persona):
         """Test that English persona chunks are appropriately sized."""
-        english_personas = ["elon_musk", "queen_elizabeth_ii"]
+        sizes = _persona_entry(chunk_summary, persona)["sizes"]
         
-        for persona in english_personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            total_words = 0
-            chunk_count = 0
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    content = chunk.get('chunk_text', '')
-                    word_count = len(content.split())
-                    total_words += word_count
-                    chunk_count += 1
-            
-            # Average chunk size should be reasonable for English
-            if chunk_count > 0:
-                avg_words = total_words / chunk_count
-                assert 50 <= avg_words <= 800, \
-                    f"Average {persona} chunk size {avg_words:.1f} words is outside expected range"
+        # Average chunk size should be reasonable for English
+        if sizes:
+            avg_words = sum(sizes) / len(sizes)
+            assert 50 <= avg_words <= 800, \
+                f"Average {persona} chunk size {avg_words:.1f} words is outside expected range"
 
 
+@pytest.mark.quality
 class TestContentMetadataLinkage:
     """Test suite for validating links between chunks and source documents."""
 
-    def test_chunk_references_valid_documents(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_references_valid_documents(self, all_chunks, document_ids, persona):
         """Test that chunks reference existing source documents."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        chunk_files = _persona_entry(all_chunks, persona)
+        doc_ids = document_ids.get(persona)
         
-        for persona in personas:
-            # Load available documents
-            docs_dir = dataset_root / "datasets" / persona / "processed_data"
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not docs_dir.exists() or not chunks_dir.exists():
-                continue
-            
-            # Get all document IDs
-            doc_ids = set()
-            for doc_file in docs_dir.glob("*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    doc_data = json.load(f)
-                    if isinstance(doc_data, list):
-                        doc_ids.update(doc.get('id') or doc.get('doc_id') for doc in doc_data)
-                    else:
-                        doc_ids.add(doc_data.get('id') or doc_data.get('doc_id'))
-            
-            # Check chunks reference valid documents
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
+        # Verify documents exist (if we have document IDs)
+        if not doc_ids:
+            pytest.skip(f"No document IDs found for {persona}")
+        
+        # Collect the distinct base document IDs referenced by chunks
+        referenced = set()
+        for chunk_file, chunks in chunk_files:
+            for chunk in chunks:
+                metadata = chunk.get('chunk_metadata', {})
+                source_id = metadata.get('source_doc_id') or metadata.get('doc_id')
                 
-                for chunk in chunks:
-                    metadata = chunk.get('chunk_metadata', {})
-                    source_id = metadata.get('source_doc_id') or metadata.get('doc_id')
-                    
-                    if source_id:
-                        # Extract base document ID (handle hierarchical IDs)
-                        base_id = source_id.split('_chunk_')[0] if '_chunk_' in source_id else source_id
-                        
-                        # Verify document exists (if we have document IDs)
-                        if doc_ids:
-                            # Allow for flexible matching
-                            matching = any(base_id in str(doc_id) or str(doc_id) in base_id 
-                                         for doc_id in doc_ids if doc_id)
-                            
-                            if not matching:
-                                pytest.warn(
-                                    f"Chunk {chunk.get('chunk_id')} references "
-                                    f"unknown document {base_id} in {persona}"
-                                )
-
-    def test_chunk_id_format_consistency(self, dataset_root):
+                if source_id:
+                    # Extract base document ID (handle hierarchical IDs)
+                    referenced.add(source_id.split('_chunk_')[0])
+        
+        # Exact matches drop out in the set difference; only the
+        # remainder gets the flexible substring match
+        unknown = sorted(
+            base_id for base_id in referenced - doc_ids
+            if not any(base_id in doc_id or doc_id in base_id for doc_id in doc_ids)
+        )
+        
+        if unknown:
+            warnings.warn(
+                f"{persona}: {len(unknown)} chunk document references are "
+                f"unknown: {unknown[:5]}"
+            )
+
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_id_format_consistency(self, all_chunks, persona):
         """Test that chunk IDs follow consistent naming patterns."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
+        for chunk_file, chunks in _persona_entry(all_chunks, persona):
+            for chunk in chunks:
+                chunk_id = chunk.get('chunk_id', '')
+                
+                # Verify chunk ID is not empty
+                assert chunk_id, f"Empty chunk_id in {chunk_file.name}"
+                
+                # Verify chunk ID is string
+                assert isinstance(chunk_id, str), \
+                    f"chunk_id must be string in {chunk_file.name}"
                 
-                for chunk in chunks:
-                    chunk_id = chunk.get('chunk_id', '')
-                    
-                    # Verify chunk ID is not empty
-                    assert chunk_id, f"Empty chunk_id in {chunk_file.name}"
-                    
-                    # Verify chunk ID is string
-                    assert isinstance(chunk_id, str), \
-                        f"chunk_id must be string in {chunk_file.name}"
-                    
-                    # Verify reasonable length
-                    assert len(chunk_id) > 0 and len(chunk_id) < 200, \
-                        f"chunk_id has unusual length in {chunk_file.name}"
+                # Verify reasonable length
+                assert len(chunk_id) > 0 and len(chunk_id) < 200, \
+                    f"chunk_id has unusual length in {chunk_file.name}"
 
 
+@pytest.mark.quality
 class TestChunkStatisticsConsistency:
     """Test suite for validating chunk-level statistics."""
 
-    def test_chunk_counts_match_statistics(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_counts_match_statistics(self, statistics_data, all_chunks, persona):
         """Test that actual chunk counts match reported statistics."""
-        statistics_file = dataset_root / "statistics.json"
+        chunk_files = _persona_entry(all_chunks, persona)
+        persona_stat = statistics_data.get('personas', {}).get(persona)
         
-        if not statistics_file.exists():
-            pytest.skip("statistics.json not found")
+        if persona_stat is None:
+            pytest.skip(f"No statistics recorded for {persona}")
         
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
+        # Count actual chunks
+        actual_count = sum([len(chunks) for _, chunks in chunk_files])
         
-        personas_map = {
-            "du_fu": "杜甫",
-            "elon_musk": "Elon Musk",
-            "queen_elizabeth_ii": "Queen Elizabeth II"
-        }
+        # Find expected count in statistics
+        expected_count = persona_stat.get('chunks', {}).get('total')
         
-        for persona_dir, persona_name in personas_map.items():
-            chunks_dir = dataset_root / "datasets" / persona_dir / "chunks"
-            
-            if not chunks_dir.exists():
-                continue
-            
-            # Count actual chunks
-            actual_count = 0
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                    actual_count += len(chunks)
-            
-            # Find expected count in statistics
-            for persona_stat in stats.get('persona_statistics', []):
-                if persona_stat.get('persona') == persona_name:
-                    expected_count = persona_stat.get('chunks_count')
-                    
-                    if expected_count is not None:
-                        # Allow for small discrepancies (±5%)
-                        tolerance = max(1, int(expected_count * 0.05))
-                        assert abs(actual_count - expected_count) <= tolerance, \
-                            f"{persona_name}: Expected ~{expected_count} chunks, found {actual_count}"
-                    break
+        if expected_count is not None:
+            # Allow for small discrepancies (±5%)
+            tolerance = max(1, int(expected_count * 0.05))
+            assert abs(actual_count - expected_count) <= tolerance, \
+                f"{persona}: Expected ~{expected_count} chunks, found {actual_count}"
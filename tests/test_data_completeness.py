@@ -5,63 +5,180 @@ This module verifies that all expected files are present, all personas
 are properly covered, and metadata is complete across the dataset.
 """
 
-import json
 import pytest
 from pathlib import Path
 from typing import Dict, List, Set
 
+from personas import PERSONA_IDENTIFIERS
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+# Minimum processed document counts per persona
+MINIMUM_DOCUMENT_COUNTS = {
+    "du_fu": 1000,              # Should have ~1,496 documents
+    "elon_musk": 30,            # Should have ~48 documents
+    "queen_elizabeth_ii": 15    # Should have ~22 documents
+}
+
+# Accepted language names and codes per persona
+EXPECTED_LANGUAGES = {
+    "du_fu": ["zh", "zho", "chi", "Classical Chinese", "lzh"],  # Chinese variants
+    "elon_musk": ["en", "eng", "English"],      # English variants
+    "queen_elizabeth_ii": ["en", "eng", "English"]
+}
+
+# Flexible field names to accommodate different file structures
+REQUIRED_FIELD_SETS = [
+    ['id', 'content', 'metadata'],      # For structured_documents.json
+    ['chunk_id', 'content', 'metadata']  # For training_chunks.json
+]
+
+# REQUIRED_FIELD_SETS as frozensets, for C-level subset checks against
+# dict keys, and the identifier fields that satisfy the contract on their own
+_REQUIRED_FIELD_FROZENSETS = [frozenset(fields) for fields in REQUIRED_FIELD_SETS]
+_DOCUMENT_ID_FIELDS = frozenset({'chunk_id', 'id', 'doc_id'})
+
+# Files whose records must satisfy the document contract
+DOCUMENT_FILES = ['training_chunks.json', 'structured_documents.json']
+
+# Files and directories that must be present
+REQUIRED_ROOT_FILES = ("README.md", "LICENSE", "requirements.txt")
+REQUIRED_PERSONA_SUBDIRS = ("raw_data", "processed_data")
+DOCUMENTATION_FILES = ("README.md",)
+
+# Document fields that should never be empty
+CRITICAL_FIELDS = ("id", "content")
+
+# Key metadata elements (flexible checking for different formats)
+DUBLIN_CORE_ELEMENTS = frozenset({
+    'title', 'creator', 'date', 'language', 'persona',
+    'identifier', 'source', 'type', 'time_period', 'poem_title',
+    'category', 'url', 'document_type'
+})
+
+# JSON Schema form of the document contract: one of the required field
+# sets, or any identifier field (files with different structures)
+DOCUMENT_SCHEMA = {
+    "type": "object",
+    "anyOf": [{"required": fields} for fields in REQUIRED_FIELD_SETS]
+    + [{"required": [field]} for field in sorted(_DOCUMENT_ID_FIELDS)]
+}
+
+# Document validator generated once from DOCUMENT_SCHEMA when
+# fastjsonschema is installed
+_validate_document = (
+    fastjsonschema.compile(DOCUMENT_SCHEMA) if fastjsonschema is not None else None
+)
+
+# Lowercased language codes per persona, for case-insensitive matching
+_LANG_CODES = {
+    persona: frozenset(code.lower() for code in codes)
+    for persona, codes in EXPECTED_LANGUAGES.items()
+}
+
+
+def _matches_document_fields(doc) -> bool:
+    """
+    Check a record against the document contract without fastjsonschema.
+    
+    Gives the same verdict as DOCUMENT_SCHEMA: the record must be an
+    object with any of the required field sets or, for files with
+    different structures, any identifier field.
+    
+    Args:
+        doc: Parsed record
+        
+    Returns:
+        bool: True if the record satisfies the contract
+    """
+    if not isinstance(doc, dict):
+        return False
+    keys = doc.keys()
+    return (
+        any(field_set <= keys for field_set in _REQUIRED_FIELD_FROZENSETS)
+        or not _DOCUMENT_ID_FIELDS.isdisjoint(keys)
+    )
+
+
+def _is_valid_document(doc) -> bool:
+    """
+    Check a record against the document contract.
+    
+    Uses the compiled DOCUMENT_SCHEMA validator when fastjsonschema is
+    installed, otherwise _matches_document_fields.
+    
+    Args:
+        doc: Parsed record
+        
+    Returns:
+        bool: True if the record satisfies the contract
+    """
+    if _validate_document is None:
+        return _matches_document_fields(doc)
+    try:
+        _validate_document(doc)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
+
+def _iter_docs(data):
+    """
+    Iterate over the records of a parsed processed_data file.
+    
+    Args:
+        data: Parsed JSON, either a list of records or a single record
+        
+    Yields:
+        Each record in turn
+    """
+    if isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+@pytest.mark.completeness
 class TestExpectedFilePresence:
     """Test suite for verifying presence of expected files."""
 
-    def test_root_level_files_exist(self, dataset_root):
+    def test_root_level_files_exist(self, root_entries):
         """Test that all required root-level files are present."""
-        required_files = [
-            "README.md",
-            "LICENSE",
-            "requirements.txt"
-        ]
-        
-        for filename in required_files:
-            filepath = dataset_root / filename
-            assert filepath.exists(), f"Required file missing: {filename}"
+        for filename in REQUIRED_ROOT_FILES:
+            assert filename in root_entries, f"Required file missing: {filename}"
 
     def test_persona_directories_exist(self, dataset_root):
         """Test that all three persona directories exist."""
-        expected_personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
         datasets_dir = dataset_root / "datasets"
         
         assert datasets_dir.exists(), "datasets/ directory not found"
         
-        for persona in expected_personas:
+        for persona in PERSONA_IDENTIFIERS:
             persona_dir = datasets_dir / persona
             assert persona_dir.exists(), f"Persona directory missing: {persona}"
 
-    def test_persona_subdirectories_exist(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_persona_subdirectories_exist(self, persona_layout, persona):
         """Test that each persona has required subdirectories."""
-        required_subdirs = ["raw_data", "processed_data"]
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        subdirs = persona_layout[persona]["subdirs"]
         
-        for persona in personas:
-            persona_dir = dataset_root / "datasets" / persona
-            
-            for subdir in required_subdirs:
-                subdir_path = persona_dir / subdir
-                assert subdir_path.exists(), \
-                    f"Missing {subdir}/ directory for {persona}"
+        for subdir in REQUIRED_PERSONA_SUBDIRS:
+            assert subdir in subdirs, \
+                f"Missing {subdir}/ directory for {persona}"
 
-    def test_metadata_files_exist(self, dataset_root):
+    def test_metadata_files_exist(self, persona_layout):
         """Test that metadata files exist for each persona."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            metadata_dir = dataset_root / "datasets" / persona / "metadata"
+        for persona in PERSONA_IDENTIFIERS:
+            layout = persona_layout[persona]
             
             # Metadata directory might be optional depending on structure
-            if metadata_dir.exists():
+            if layout["has_metadata"]:
                 # If it exists, check for expected files
-                metadata_files = list(metadata_dir.glob("*.json"))
-                assert len(metadata_files) > 0, \
+                assert len(layout["metadata_json"]) > 0, \
                     f"No metadata files found for {persona}"
 
     def test_documentation_files_exist(self, dataset_root):
@@ -70,377 +187,322 @@ class TestExpectedFilePresence:
         
         if docs_dir.exists():
             # Check for key documentation files
-            expected_docs = ["README.md"]
-            
-            for doc in expected_docs:
+            for doc in DOCUMENTATION_FILES:
                 doc_path = docs_dir / doc
                 if not doc_path.exists():
                     import warnings
                     warnings.warn(f"Documentation file missing: {doc}")
 
 
+@pytest.mark.completeness
 class TestPersonaCoverage:
     """Test suite for verifying complete persona coverage."""
 
-    def test_all_personas_have_data(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_all_personas_have_data(self, persona_layout, persona):
         """Test that all three personas have data files."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        layout = persona_layout[persona]
         
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
-                pytest.fail(f"No processed data directory for {persona}")
-            
-            data_files = list(processed_dir.glob("*.json"))
-            assert len(data_files) > 0, \
-                f"No data files found for {persona} in processed/"
+        if not layout["has_processed"]:
+            pytest.fail(f"No processed data directory for {persona}")
+        
+        assert len(layout["processed_json"]) > 0, \
+            f"No data files found for {persona} in processed/"
 
-    def test_all_personas_have_chunks(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_all_personas_have_chunks(self, persona_layout, persona):
         """Test that all three personas have chunk files."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        layout = persona_layout[persona]
         
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
-                pytest.fail(f"No processed_data directory for {persona}")
-            
-            # Look for training_chunks.json file
-            chunk_file = processed_dir / "training_chunks.json"
-            assert chunk_file.exists(), \
-                f"No training_chunks.json file found for {persona}"
+        if not layout["has_processed"]:
+            pytest.fail(f"No processed_data directory for {persona}")
+        
+        # Look for training_chunks.json file
+        assert layout["has_chunks"], \
+            f"No training_chunks.json file found for {persona}"
 
-    def test_personas_listed_in_statistics(self, dataset_root):
+    def test_personas_listed_in_statistics(self, statistics_data):
         """Test that all personas are represented in statistics.json."""
-        statistics_file = dataset_root / "statistics.json"
-        
-        if not statistics_file.exists():
-            pytest.skip("statistics.json not found")
-        
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
-        
-        expected_personas = {"杜甫", "Elon Musk", "Queen Elizabeth II"}
+        expected_personas = set(PERSONA_IDENTIFIERS)
         
-        persona_stats = stats.get('persona_statistics', [])
-        found_personas = {stat.get('persona') for stat in persona_stats}
+        found_personas = set(statistics_data.get('personas', {}))
         
         assert expected_personas.issubset(found_personas), \
             f"Missing personas in statistics: {expected_personas - found_personas}"
 
-    def test_minimum_document_counts(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_minimum_document_counts(self, dataset_root, loaded_json, json_file_index,
+                                     statistics_data, pytestconfig, persona):
         """Test that each persona has minimum expected document counts."""
-        expected_minimums = {
-            "du_fu": 1000,              # Should have ~1,496 documents
-            "elon_musk": 30,            # Should have ~48 documents
-            "queen_elizabeth_ii": 15    # Should have ~22 documents
-        }
-        
-        for persona, min_count in expected_minimums.items():
+        if pytestconfig.getoption("--fast"):
+            # Trust the recorded count; statistics.json is checked separately
+            persona_stat = statistics_data.get('personas', {}).get(persona, {})
+            doc_count = persona_stat.get('documents', {}).get('total', 0)
+        else:
             processed_dir = dataset_root / "datasets" / persona / "processed_data"
             
             if not processed_dir.exists():
-                continue
+                pytest.skip(f"No processed_data directory for {persona}")
             
             # Count documents
             doc_count = 0
-            for data_file in processed_dir.glob("*.json"):
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        doc_count += len(data)
-                    else:
-                        doc_count += 1
-            
-            assert doc_count >= min_count, \
-                f"{persona} has {doc_count} documents, expected at least {min_count}"
+            for data_file in json_file_index["by_dir"].get(str(processed_dir), []):
+                data = loaded_json(data_file)
+                if isinstance(data, list):
+                    doc_count += len(data)
+                else:
+                    doc_count += 1
+        
+        min_count = MINIMUM_DOCUMENT_COUNTS[persona]
+        assert doc_count >= min_count, \
+            f"{persona} has {doc_count} documents, expected at least {min_count}"
 
 
+@pytest.mark.completeness
 class TestMetadataCompleteness:
     """Test suite for verifying metadata field completeness."""
 
-    def test_documents_have_required_metadata(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_documents_have_required_metadata(self, dataset_root, loaded_json, json_file_index, persona):
         """Test that all documents contain required metadata fields."""
-        # Flexible field names to accommodate different file structures
-        required_field_sets = [
-            ['id', 'content', 'metadata'],      # For structured_documents.json
-            ['chunk_id', 'content', 'metadata']  # For training_chunks.json
-        ]
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        processed_dir = dataset_root / "datasets" / persona / "processed_data"
         
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
+        if not processed_dir.exists():
+            pytest.skip(f"No processed_data directory for {persona}")
+        
+        for data_file in json_file_index["by_dir"].get(str(processed_dir), []):
+            # Only files that should have document structure are checked
+            if data_file.name not in DOCUMENT_FILES:
                 continue
             
-            for data_file in processed_dir.glob("*.json"):
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                docs = data if isinstance(data, list) else [data]
-                
-                for doc in docs:
-                    # Check if any of the required field sets is satisfied
-                    has_valid_fields = False
-                    for field_set in required_field_sets:
-                        if all(field in doc for field in field_set):
-                            has_valid_fields = True
-                            break
-                    
-                    # Allow files with different structures (like processing reports)
-                    if 'chunk_id' in doc or 'id' in doc or 'doc_id' in doc:
-                        has_valid_fields = True
-                    
-                    # Only assert for files that should have document structure
-                    if data_file.name in ['training_chunks.json', 'structured_documents.json']:
-                        assert has_valid_fields, \
-                            f"Missing required fields in {persona}/{data_file.name}"
+            data = loaded_json(data_file)
+            
+            for doc in _iter_docs(data):
+                assert _is_valid_document(doc), \
+                    f"Missing required fields in {persona}/{data_file.name}"
 
-    def test_metadata_fields_not_empty(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_metadata_fields_not_empty(self, dataset_root, loaded_json, json_file_index, persona):
         """Test that critical metadata fields are not empty."""
-        critical_fields = ['id', 'content']
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
         empty_field_count = {}
         
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
-                continue
+        processed_dir = dataset_root / "datasets" / persona / "processed_data"
+        
+        if not processed_dir.exists():
+            pytest.skip(f"No processed_data directory for {persona}")
+        
+        for data_file in json_file_index["by_dir"].get(str(processed_dir), []):
+            data = loaded_json(data_file)
             
-            for data_file in processed_dir.glob("*.json"):
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                docs = data if isinstance(data, list) else [data]
-                
-                for doc in docs:
-                    for field in critical_fields:
-                        value = doc.get(field) or doc.get(field.replace('_', ''))
-                        
-                        if not value or (isinstance(value, str) and not value.strip()):
-                            key = f"{persona}/{field}"
-                            empty_field_count[key] = empty_field_count.get(key, 0) + 1
+            for doc in _iter_docs(data):
+                for field in CRITICAL_FIELDS:
+                    value = doc.get(field) or doc.get(field.replace('_', ''))
+                    
+                    if not value or (isinstance(value, str) and not value.strip()):
+                        key = f"{persona}/{field}"
+                        empty_field_count[key] = empty_field_count.get(key, 0) + 1
         
         # Report any empty critical fields (use warning instead of failing)
         if empty_field_count:
             import warnings
             warnings.warn(f"Found empty critical fields: {empty_field_count}")
 
-    def test_dublin_core_metadata_presence(self, dataset_root):
+    def test_dublin_core_metadata_presence(self, loaded_json, persona_sample):
         """Test that documents include key Dublin Core metadata elements."""
-        # Key metadata elements (flexible checking for different formats)
-        metadata_elements = [
-            'title', 'creator', 'date', 'language', 'persona',
-            'identifier', 'source', 'type', 'time_period', 'poem_title',
-            'category', 'url', 'document_type'
-        ]
+        persona, sample_file = persona_sample
+        if not sample_file:
+            pytest.skip(f"No processed data files for {persona}")
         
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
+        data = loaded_json(sample_file)
         
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
-                continue
-            
-            sample_file = next(processed_dir.glob("*.json"), None)
-            if not sample_file:
-                continue
-            
-            with open(sample_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            doc = data[0] if isinstance(data, list) else data
-            
-            # Check both document level and metadata level
-            doc_level_fields = [elem for elem in metadata_elements if elem in doc]
-            metadata = doc.get('metadata', {})
-            metadata_level_fields = [elem for elem in metadata_elements if elem in metadata]
-            
-            found_elements = list(set(doc_level_fields + metadata_level_fields))
-            
-            # Should have at least 2 metadata elements
-            assert len(found_elements) >= 2, \
-                f"{persona} missing key metadata (found: {found_elements}, file: {sample_file.name})"
+        doc = data[0] if isinstance(data, list) else data
+        
+        # Check both document level and metadata level
+        metadata = doc.get('metadata', {})
+        found_elements = sorted(
+            elem for elem in DUBLIN_CORE_ELEMENTS if elem in doc or elem in metadata
+        )
+        
+        # Should have at least 2 metadata elements
+        assert len(found_elements) >= 2, \
+            f"{persona} missing key metadata (found: {found_elements}, file: {sample_file.name})"
 
 
+@pytest.mark.completeness
 class TestCrossReferenceIntegrity:
     """Test suite for validating cross-references between data structures."""
 
-    def test_chunk_document_linkage(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_chunk_document_linkage(self, dataset_root, loaded_json, json_file_index, persona):
         """Test that chunks properly link back to source documents."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            chunks_dir = dataset_root / "datasets" / persona / "chunks"
-            
-            if not processed_dir.exists() or not chunks_dir.exists():
-                continue
-            
-            # Collect document IDs
-            doc_ids = set()
-            for doc_file in processed_dir.glob("*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        processed_dir = dataset_root / "datasets" / persona / "processed_data"
+        chunks_dir = dataset_root / "datasets" / persona / "chunks"
+        
+        if not processed_dir.exists() or not chunks_dir.exists():
+            pytest.skip(f"No processed_data or chunks directory for {persona}")
+        
+        # Collect document IDs
+        doc_ids = set()
+        for doc_file in json_file_index["by_dir"].get(str(processed_dir), []):
+            data = loaded_json(doc_file)
+            
+            for doc in _iter_docs(data):
+                doc_id = doc.get('id') or doc.get('doc_id')
+                if doc_id:
+                    doc_ids.add(str(doc_id))
+        
+        # Check chunk references
+        orphaned_chunks = []
+        for chunk_file in json_file_index["by_dir"].get(str(chunks_dir), []):
+            chunks = loaded_json(chunk_file)
+            
+            for chunk in chunks:
+                metadata = chunk.get('chunk_metadata', {})
+                source_id = metadata.get('source_doc_id') or metadata.get('doc_id')
                 
-                docs = data if isinstance(data, list) else [data]
-                for doc in docs:
-                    doc_id = doc.get('id') or doc.get('doc_id')
-                    if doc_id:
-                        doc_ids.add(str(doc_id))
-            
-            # Check chunk references
-            orphaned_chunks = []
-            for chunk_file in chunks_dir.glob("*.json"):
-                with open(chunk_file, 'r', encoding='utf-8') as f:
-                    chunks = json.load(f)
-                
-                for chunk in chunks:
-                    metadata = chunk.get('chunk_metadata', {})
-                    source_id = metadata.get('source_doc_id') or metadata.get('doc_id')
+                if source_id:
+                    # Extract base ID
+                    base_id = str(source_id).split('_chunk_')[0]
                     
-                    if source_id:
-                        # Extract base ID
-                        base_id = str(source_id).split('_chunk_')[0]
-                        
-                        # Check if any document ID matches
-                        if doc_ids and not any(base_id in doc_id or doc_id in base_id 
-                                              for doc_id in doc_ids):
-                            orphaned_chunks.append(chunk.get('chunk_id'))
-            
-            # Allow some orphaned chunks (data processing artifacts)
-            if len(orphaned_chunks) > 0:
-                orphan_ratio = len(orphaned_chunks) / max(1, len(doc_ids))
-                assert orphan_ratio < 0.1, \
-                    f"{persona} has {len(orphaned_chunks)} orphaned chunks (>{10}% of docs)"
+                    # Exact matches are a set lookup; only the rest fall
+                    # back to the substring scan over every document ID
+                    if not doc_ids or base_id in doc_ids:
+                        continue
+                    if not any(base_id in doc_id or doc_id in base_id
+                               for doc_id in doc_ids):
+                        orphaned_chunks.append(chunk.get('chunk_id'))
+        
+        # Allow some orphaned chunks (data processing artifacts)
+        if len(orphaned_chunks) > 0:
+            orphan_ratio = len(orphaned_chunks) / max(1, len(doc_ids))
+            assert orphan_ratio < 0.1, \
+                f"{persona} has {len(orphaned_chunks)} orphaned chunks (>{10}% of docs)"
 
-    def test_statistics_match_actual_files(self, dataset_root):
+    def test_statistics_match_actual_files(self, statistics_data):
         """Test that statistics.json matches actual file structure."""
-        statistics_file = dataset_root / "statistics.json"
-        
-        if not statistics_file.exists():
-            pytest.skip("statistics.json not found")
-        
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
+        overview = statistics_data.get('overview', {})
         
         # Verify total counts are reasonable
-        total_docs = stats.get('total_documents', 0)
-        total_chunks = stats.get('total_chunks', 0)
+        total_docs = overview.get('total_documents', 0)
+        total_chunks = overview.get('total_chunks', 0)
         
         assert total_docs > 0, "statistics.json reports 0 documents"
         assert total_chunks > 0, "statistics.json reports 0 chunks"
         assert total_chunks > total_docs, "Should have more chunks than documents"
 
-    def test_consistent_language_codes(self, dataset_root):
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_consistent_language_codes(self, dataset_root, loaded_json, json_file_index, persona):
         """Test that language codes are consistent across metadata."""
-        expected_languages = {
-            "du_fu": ["zh", "zho", "chi", "Classical Chinese", "lzh"],  # Chinese variants
-            "elon_musk": ["en", "eng", "English"],      # English variants
-            "queen_elizabeth_ii": ["en", "eng", "English"]
-        }
+        processed_dir = dataset_root / "datasets" / persona / "processed_data"
         
-        for persona, valid_codes in expected_languages.items():
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
+        if not processed_dir.exists():
+            pytest.skip(f"No processed_data directory for {persona}")
+        
+        # Sample a few documents
+        sample_files = json_file_index["by_dir"].get(str(processed_dir), [])[:3]
+        
+        for doc_file in sample_files:
+            data = loaded_json(doc_file)
             
-            if not processed_dir.exists():
-                continue
+            doc = data[0] if isinstance(data, list) else data
+            metadata = doc.get('metadata', {})
             
-            # Sample a few documents
-            sample_files = list(processed_dir.glob("*.json"))[:3]
+            lang = metadata.get('language') or metadata.get('lang')
             
-            for doc_file in sample_files:
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                doc = data[0] if isinstance(data, list) else data
-                metadata = doc.get('metadata', {})
-                
-                lang = metadata.get('language') or metadata.get('lang')
-                
-                if lang:
-                    # Check if language name or code is in valid set
-                    lang_str = str(lang)
-                    assert any(code.lower() in lang_str.lower() or lang_str.lower() in code.lower() 
-                              for code in valid_codes), \
-                        f"{persona} has unexpected language code: {lang}"
+            if lang:
+                # Check if language name or code is in valid set; exact
+                # matches skip the substring fallback
+                lang_l = str(lang).lower()
+                valid_codes = _LANG_CODES[persona]
+                assert lang_l in valid_codes or any(
+                    code in lang_l or lang_l in code for code in valid_codes
+                ), f"{persona} has unexpected language code: {lang}"
 
 
+@pytest.mark.completeness
 class TestDataQualityMetrics:
     """Test suite for overall data quality metrics."""
 
-    def test_reasonable_data_distribution(self, dataset_root):
+    def test_reasonable_data_distribution(self, statistics_data):
         """Test that data distribution across personas is reasonable."""
-        statistics_file = dataset_root / "statistics.json"
-        
-        if not statistics_file.exists():
-            pytest.skip("statistics.json not found")
-        
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
-        
-        persona_stats = stats.get('persona_statistics', [])
+        persona_stats = statistics_data.get('personas', {})
         
         # Check that no persona is empty
-        for persona_stat in persona_stats:
-            persona = persona_stat.get('persona')
-            doc_count = persona_stat.get('documents_count', 0)
-            chunk_count = persona_stat.get('chunks_count', 0)
+        for persona, persona_stat in persona_stats.items():
+            doc_count = persona_stat.get('documents', {}).get('total', 0)
+            chunk_count = persona_stat.get('chunks', {}).get('total', 0)
             
             assert doc_count > 0, f"{persona} has no documents"
             assert chunk_count > 0, f"{persona} has no chunks"
 
-    def test_all_files_are_valid_json(self, dataset_root):
-        """Test that all JSON files are valid and parseable."""
-        invalid_files = []
+    def test_no_zero_byte_json_files(self, dataset_root, json_file_index):
+        """Test that no JSON file is empty (full parsing is the slow bulk test)."""
+        empty_files = [
+            str(json_file.relative_to(dataset_root))
+            for json_file in json_file_index["all"]
+            if json_file.stat().st_size == 0
+        ]
         
-        # Check all JSON files in dataset
-        for json_file in dataset_root.rglob("*.json"):
-            # Skip very large files or special files
-            if json_file.stat().st_size > 50 * 1024 * 1024:  # Skip >50MB files
-                continue
-            
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
-            except json.JSONDecodeError as e:
-                invalid_files.append(f"{json_file.relative_to(dataset_root)}: {str(e)}")
-            except Exception as e:
-                invalid_files.append(f"{json_file.relative_to(dataset_root)}: {type(e).__name__}")
-        
-        assert len(invalid_files) == 0, \
-            f"Found {len(invalid_files)} invalid JSON files: {invalid_files[:5]}"
-
-    def test_no_duplicate_documents(self, dataset_root):
+        assert len(empty_files) == 0, \
+            f"Found {len(empty_files)} empty JSON files: {empty_files[:5]}"
+
+    @pytest.mark.parametrize("persona", PERSONA_IDENTIFIERS)
+    def test_no_duplicate_documents(self, dataset_root, loaded_json, json_file_index, persona):
         """Test that there are no duplicate document IDs within personas."""
-        personas = ["du_fu", "elon_musk", "queen_elizabeth_ii"]
-        
-        for persona in personas:
-            processed_dir = dataset_root / "datasets" / persona / "processed_data"
-            
-            if not processed_dir.exists():
-                continue
-            
-            doc_ids = set()
-            duplicates = []
-            
-            for doc_file in processed_dir.glob("*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                docs = data if isinstance(data, list) else [data]
-                
-                for doc in docs:
-                    doc_id = doc.get('id') or doc.get('doc_id')
-                    if doc_id:
-                        if doc_id in doc_ids:
-                            duplicates.append(doc_id)
-                        doc_ids.add(doc_id)
-            
-            assert len(duplicates) == 0, \
-                f"{persona} has {len(duplicates)} duplicate document IDs: {duplicates[:5]}"
+        processed_dir = dataset_root / "datasets" / persona / "processed_data"
+        
+        if not processed_dir.exists():
+            pytest.skip(f"No processed_data directory for {persona}")
+        
+        doc_ids = set()
+        
+        for doc_file in json_file_index["by_dir"].get(str(processed_dir), []):
+            data = loaded_json(doc_file)
+            
+            for doc in _iter_docs(data):
+                doc_id = doc.get('id') or doc.get('doc_id')
+                if not doc_id:
+                    continue
+                # One hash operation per ID: the set only stays the same
+                # size when the ID was already present. Stop at the first
+                # duplicate rather than scanning the rest
+                seen_count = len(doc_ids)
+                doc_ids.add(doc_id)
+                if len(doc_ids) == seen_count:
+                    pytest.fail(f"{persona} has duplicate document ID {doc_id} in {doc_file.name}")
+
+
+# Records checked against both forms of the document contract, with the
+# expected verdict
+DOCUMENT_CONTRACT_SAMPLES = [
+    ({"id": "a", "content": "x", "metadata": {}}, True),
+    ({"chunk_id": "a", "content": "x", "metadata": {}}, True),
+    ({"doc_id": "a"}, True),
+    ({"content": "x", "metadata": {}}, False),
+    ({}, False),
+    (["id", "content", "metadata"], False),
+    ("id", False),
+    (None, False),
+]
+
+
+@pytest.mark.completeness
+class TestDocumentContract:
+    """Test that both document validation paths give the same verdict."""
+
+    @pytest.mark.parametrize("doc, expected", DOCUMENT_CONTRACT_SAMPLES)
+    def test_fallback_verdict(self, doc, expected):
+        """Test the plain-Python check on accept/reject samples."""
+        assert _matches_document_fields(doc) is expected
+
+    @pytest.mark.parametrize("doc, expected", DOCUMENT_CONTRACT_SAMPLES)
+    def test_schema_verdict(self, doc, expected):
+        """Test DOCUMENT_SCHEMA on the same accept/reject samples."""
+        schema_lib = pytest.importorskip("fastjsonschema")
+        validate = schema_lib.compile(DOCUMENT_SCHEMA)
+        try:
+            validate(doc)
+            verdict = True
+        except schema_lib.JsonSchemaException:
+            verdict = False
+        assert verdict is expected
@@ -11,27 +11,46 @@ Test Categories:
     - Data structure consistency
 """
 
-import json
+import os
 import pytest
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
+
+
+# JSON files larger than this are skipped by the bulk parse test
+MAX_JSON_FILE_BYTES = 50 * 1024 * 1024
+
+# Keys each statistics.json section must contain
+REQUIRED_STATISTICS_KEYS = (
+    "dataset_version",
+    "overview",
+    "personas",
+    "quality_metrics",
+    "distribution"
+)
+REQUIRED_PERSONA_FIELDS = ("display_name", "type", "language", "era",
+                           "documents", "chunks", "content")
+EXPECTED_QUALITY_METRICS = ("data_coverage", "unique_sources",
+                            "data_validation", "format_consistency")
+REQUIRED_OVERVIEW_TOTALS = ("total_personas", "total_documents",
+                            "total_chunks", "total_words")
 
 
 @pytest.mark.integrity
 class TestJSONFileIntegrity:
     """Test suite for JSON file loading and parsing."""
     
-    def test_statistics_file_loads(self, statistics_file: Path):
+    def test_statistics_file_loads(self, statistics_file: Path, loaded_json: Callable[[Path], Any]):
         """
         Verify that statistics.json loads without errors.
         
         Args:
             statistics_file: Path fixture to statistics.json
+            loaded_json: Memoised JSON loader fixture
         """
         assert statistics_file.exists(), f"Statistics file not found: {statistics_file}"
         
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = loaded_json(statistics_file)
         
         assert isinstance(data, dict), "Statistics file must contain a JSON object"
         assert len(data) > 0, "Statistics file must not be empty"
@@ -43,32 +62,27 @@ class TestJSONFileIntegrity:
         Args:
             statistics_data: Loaded statistics data fixture
         """
-        required_keys = [
-            "dataset_version",
-            "overview",
-            "personas",
-            "quality_metrics",
-            "distribution"
-        ]
-        
-        for key in required_keys:
-            assert key in statistics_data, f"Missing required key in statistics: {key}"
+        missing = [key for key in REQUIRED_STATISTICS_KEYS if key not in statistics_data]
+        assert not missing, f"Missing required keys in statistics: {missing}"
     
-    def test_all_metadata_files_load(self, metadata_path: Path):
+    def test_all_metadata_files_load(self, metadata_path: Path,
+                                     loaded_json: Callable[[Path], Any],
+                                     json_file_index: Dict[str, Any]):
         """
         Verify that all JSON files in metadata directory load successfully.
         
         Args:
             metadata_path: Path fixture to metadata directory
+            loaded_json: Memoised JSON loader fixture
+            json_file_index: Session index of JSON files
         """
-        json_files = list(metadata_path.glob("*.json"))
+        json_files = json_file_index["by_dir"].get(str(metadata_path), [])
         assert len(json_files) > 0, "No JSON files found in metadata directory"
         
         failed_files = []
         for json_file in json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
+                loaded_json(json_file)
             except Exception as e:
                 failed_files.append((json_file.name, str(e)))
         
@@ -84,10 +98,11 @@ class TestJSONFileIntegrity:
             datasets_dir: Path fixture to datasets directory
             persona_identifiers: List of expected persona IDs
         """
-        for persona_id in persona_identifiers:
-            persona_dir = datasets_dir / persona_id
-            assert persona_dir.exists(), f"Persona directory not found: {persona_id}"
-            assert persona_dir.is_dir(), f"Persona path is not a directory: {persona_id}"
+        missing = [
+            persona_id for persona_id in persona_identifiers
+            if not (datasets_dir / persona_id).is_dir()
+        ]
+        assert not missing, f"Persona directories not found: {missing}"
 
 
 @pytest.mark.integrity
@@ -102,43 +117,40 @@ class TestEncodingConsistency:
             statistics_file: Path fixture to statistics.json
         """
         # This test passes if file opens without UnicodeDecodeError
-        with open(statistics_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = statistics_file.read_bytes().decode('utf-8')
         
         assert len(content) > 0, "Statistics file is empty"
     
-    def test_metadata_files_utf8_encoding(self, metadata_path: Path):
+    def test_metadata_files_utf8_encoding(self, metadata_path: Path,
+                                          json_file_index: Dict[str, Any]):
         """
         Verify that all metadata JSON files use UTF-8 encoding.
         
         Args:
             metadata_path: Path fixture to metadata directory
+            json_file_index: Session index of JSON files
         """
-        json_files = list(metadata_path.glob("*.json"))
+        json_files = json_file_index["by_dir"].get(str(metadata_path), [])
         
         encoding_errors = []
         for json_file in json_files:
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    f.read()
+                json_file.read_bytes().decode('utf-8')
             except UnicodeDecodeError as e:
                 encoding_errors.append((json_file.name, str(e)))
         
         assert len(encoding_errors) == 0, \
             f"UTF-8 encoding errors in {len(encoding_errors)} files: {encoding_errors}"
     
-    def test_no_byte_order_mark(self, statistics_file: Path):
+    def test_no_byte_order_mark(self, statistics_first_bytes: bytes):
         """
         Verify that JSON files do not contain UTF-8 BOM.
         
         Args:
-            statistics_file: Path fixture to statistics.json
+            statistics_first_bytes: Leading bytes of statistics.json fixture
         """
-        with open(statistics_file, 'rb') as f:
-            first_bytes = f.read(3)
-        
         # UTF-8 BOM is EF BB BF
-        assert first_bytes != b'\xef\xbb\xbf', \
+        assert statistics_first_bytes != b'\xef\xbb\xbf', \
             "File contains UTF-8 BOM, which should be removed"
 
 
@@ -146,27 +158,19 @@ class TestEncodingConsistency:
 class TestDataStructureConsistency:
     """Test suite for data structure validation."""
     
-    def test_persona_data_structure(self, statistics_data: Dict[str, Any],
-                                   persona_identifiers: List[str]):
+    def test_persona_data_structure(self, persona_record: Tuple[str, Dict[str, Any]]):
         """
         Verify that each persona has consistent data structure.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
         """
-        personas = statistics_data.get("personas", {})
-        
-        for persona_id in persona_identifiers:
-            assert persona_id in personas, f"Missing persona in statistics: {persona_id}"
-            
-            persona_data = personas[persona_id]
-            required_fields = ["display_name", "type", "language", "era", 
-                             "documents", "chunks", "content"]
-            
-            for field in required_fields:
-                assert field in persona_data, \
-                    f"Missing field '{field}' in persona '{persona_id}'"
+        persona_id, persona_data = persona_record
+        assert persona_data is not None, f"Missing persona in statistics: {persona_id}"
+        
+        missing = [field for field in REQUIRED_PERSONA_FIELDS if field not in persona_data]
+        assert not missing, \
+            f"Missing fields {missing} in persona '{persona_id}'"
     
     def test_quality_metrics_structure(self, statistics_data: Dict[str, Any]):
         """
@@ -177,12 +181,8 @@ class TestDataStructureConsistency:
         """
         quality_metrics = statistics_data.get("quality_metrics", {})
         
-        expected_metrics = ["data_coverage", "unique_sources", 
-                          "data_validation", "format_consistency"]
-        
-        for metric in expected_metrics:
-            assert metric in quality_metrics, \
-                f"Missing quality metric: {metric}"
+        missing = [metric for metric in EXPECTED_QUALITY_METRICS if metric not in quality_metrics]
+        assert not missing, f"Missing quality metrics: {missing}"
     
     def test_overview_totals_exist(self, statistics_data: Dict[str, Any]):
         """
@@ -193,61 +193,57 @@ class TestDataStructureConsistency:
         """
         overview = statistics_data.get("overview", {})
         
-        required_totals = ["total_personas", "total_documents", 
-                          "total_chunks", "total_words"]
+        missing = [key for key in REQUIRED_OVERVIEW_TOTALS if key not in overview]
+        non_integer = [
+            key for key in REQUIRED_OVERVIEW_TOTALS
+            if key in overview and not isinstance(overview[key], int)
+        ]
         
-        for total_key in required_totals:
-            assert total_key in overview, f"Missing overview total: {total_key}"
-            assert isinstance(overview[total_key], int), \
-                f"Overview total '{total_key}' must be an integer"
+        assert not missing, f"Missing overview totals: {missing}"
+        assert not non_integer, \
+            f"Overview totals must be integers: {non_integer}"
 
 
 @pytest.mark.integrity
 class TestFileAccessibility:
     """Test suite for file system accessibility."""
     
-    def test_readme_exists(self, dataset_root: Path):
+    def test_readme_exists(self, root_entries: Dict[str, os.DirEntry]):
         """
         Verify that main README.md exists and is readable.
         
         Args:
-            dataset_root: Path fixture to dataset root
+            root_entries: Dataset root directory entries fixture
         """
-        readme_path = dataset_root / "README.md"
-        assert readme_path.exists(), "Main README.md not found"
+        assert "README.md" in root_entries, "Main README.md not found"
         
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = Path(root_entries["README.md"].path).read_bytes().decode('utf-8')
         
         assert len(content) > 1000, "README.md appears to be too short or empty"
     
-    def test_license_exists(self, dataset_root: Path):
+    def test_license_exists(self, root_entries: Dict[str, os.DirEntry]):
         """
         Verify that LICENSE file exists and is readable.
         
         Args:
-            dataset_root: Path fixture to dataset root
+            root_entries: Dataset root directory entries fixture
         """
-        license_path = dataset_root / "LICENSE"
-        assert license_path.exists(), "LICENSE file not found"
+        assert "LICENSE" in root_entries, "LICENSE file not found"
         
-        with open(license_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = Path(root_entries["LICENSE"].path).read_bytes().decode('utf-8')
         
         assert len(content) > 100, "LICENSE file appears to be empty"
     
-    def test_project_summary_exists(self, dataset_root: Path):
+    def test_project_summary_exists(self, root_entries: Dict[str, os.DirEntry]):
         """
         Verify that PROJECT_SUMMARY.md exists and is readable.
         
         Args:
-            dataset_root: Path fixture to dataset root
+            root_entries: Dataset root directory entries fixture
         """
-        summary_path = dataset_root / "PROJECT_SUMMARY.md"
-        assert summary_path.exists(), "PROJECT_SUMMARY.md not found"
+        assert "PROJECT_SUMMARY.md" in root_entries, "PROJECT_SUMMARY.md not found"
         
-        with open(summary_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = Path(root_entries["PROJECT_SUMMARY.md"].path).read_bytes().decode('utf-8')
         
         assert len(content) > 500, "PROJECT_SUMMARY.md appears to be too short"
     
@@ -258,12 +254,17 @@ class TestFileAccessibility:
         Args:
             metadata_path: Path fixture to metadata directory
         """
-        assert metadata_path.exists(), "Metadata directory not found"
-        assert metadata_path.is_dir(), "Metadata path is not a directory"
+        # One scandir answers existence, type and emptiness
+        try:
+            with os.scandir(metadata_path) as entries:
+                first_entry = next(entries, None)
+        except FileNotFoundError:
+            pytest.fail("Metadata directory not found")
+        except NotADirectoryError:
+            pytest.fail("Metadata path is not a directory")
         
         # Check that directory is not empty
-        contents = list(metadata_path.iterdir())
-        assert len(contents) > 0, "Metadata directory is empty"
+        assert first_entry is not None, "Metadata directory is empty"
 
 
 @pytest.mark.integrity
@@ -271,28 +272,24 @@ class TestFileAccessibility:
 class TestBulkDataLoading:
     """Test suite for bulk data loading operations."""
     
-    def test_all_json_files_parseable(self, dataset_root: Path):
+    def test_all_json_files_parseable(self, dataset_root: Path,
+                                      validate_json: Callable[[Path], None],
+                                      json_file: Path):
         """
-        Verify that all JSON files in dataset are parseable.
+        Verify that a JSON file in the dataset is parseable.
         
-        This is a comprehensive test that may take longer to execute.
+        Parametrized over every JSON file in the dataset by the
+        pytest_generate_tests hook in conftest.py.
         
         Args:
             dataset_root: Path fixture to dataset root
+            validate_json: Validation-only JSON parser fixture
+            json_file: JSON file under test
         """
-        json_files = list(dataset_root.rglob("*.json"))
-        assert len(json_files) > 0, "No JSON files found in dataset"
-        
-        parsing_errors = []
-        for json_file in json_files:
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
-            except Exception as e:
-                parsing_errors.append({
-                    "file": str(json_file.relative_to(dataset_root)),
-                    "error": str(e)
-                })
+        if json_file.stat().st_size > MAX_JSON_FILE_BYTES:
+            pytest.skip(f"{json_file.name} is larger than 50MB")
         
-        assert len(parsing_errors) == 0, \
-            f"Failed to parse {len(parsing_errors)} JSON files: {parsing_errors[:5]}"
+        try:
+            validate_json(json_file)
+        except Exception as e:
+            pytest.fail(f"Failed to parse {json_file.relative_to(dataset_root)}: {e}")
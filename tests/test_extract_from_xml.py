@@ -0,0 +1,209 @@
+"""
+Test module for the Du Fu XML extractor.
+
+This module rebuilds Poem elements from the committed extraction output
+and checks that re-extracting them reproduces the annotation buckets, and
+checks that the byte-level pre-scan selects the same poems as iterparse.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+ET = pytest.importorskip("lxml.etree")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent
+                       / "tools" / "data_collection" / "du_fu"))
+
+from extract_from_xml import DuFuXMLExtractor  # noqa: E402
+
+
+# Poems whose Text annotations include a note stored outside Title/Jus
+# (the first entry of text_annotations, index 6 and 7 respectively)
+STRAY_NOTE_POEM_IDS = ["31405", "31406"]
+
+# Annotation buckets produced by DuFuXMLExtractor._extract_poem_data
+ANNOTATION_BUCKETS = {
+    "Text": "text_annotations",
+    "WordDictInJson": "word_dict_annotations",
+    "CharDictInJson": "char_dict_annotations",
+    "AllusionKey": "allusion_key_annotations",
+    "Image": "image_annotations",
+}
+
+
+def _add_notes(parent, notes):
+    """
+    Append a Ns element holding the given notes to parent.
+    
+    Args:
+        parent: XML Element receiving the Ns child
+        notes: List of dictionaries with type, index and content
+    """
+    ns_elem = ET.SubElement(parent, "Ns")
+    for note in notes:
+        n = ET.SubElement(ns_elem, "N", T=note["type"], I=note["index"])
+        n.text = note["content"]
+
+
+def _build_poem_element(poem: Dict[str, Any]):
+    """
+    Rebuild a Poem element from an extracted poem record.
+    
+    Bucketed notes that are not part of the title or line annotations are
+    placed in a Ns element between Title and Jus, ahead of the line notes,
+    matching their position in the committed bucket order.
+    
+    Args:
+        poem: Poem dictionary from dufu_poems_full.json
+        
+    Returns:
+        lxml Element for the poem
+    """
+    poem_elem = ET.Element("Poem", Id=poem["poem_id"], AU=poem["author"])
+    
+    title_elem = ET.SubElement(poem_elem, "Title", C=poem["title"])
+    _add_notes(title_elem, poem["title_annotations"])
+    
+    walked = poem["title_annotations"] + [
+        note for line_notes in poem["line_annotations"] for note in line_notes]
+    stray = []
+    for n_type, key in ANNOTATION_BUCKETS.items():
+        bucketed = poem[key]
+        walked_count = sum(1 for note in walked if note["type"] == n_type)
+        stray.extend({"type": n_type, **note}
+                     for note in bucketed[:len(bucketed) - walked_count])
+    _add_notes(poem_elem, stray)
+    
+    jus_elem = ET.SubElement(poem_elem, "Jus")
+    for line, line_notes in zip(poem["lines"], poem["line_annotations"]):
+        ju = ET.SubElement(jus_elem, "Ju", C=line)
+        _add_notes(ju, line_notes)
+    
+    return poem_elem
+
+
+@pytest.fixture(scope="module")
+def dufu_poems_by_id(datasets_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the committed Du Fu extraction output keyed by poem id.
+    
+    Args:
+        datasets_dir: Path to the datasets directory
+        
+    Returns:
+        Dictionary of poem id -> poem record
+    """
+    path = datasets_dir / "du_fu" / "raw_data" / "dufu_poems_full.json"
+    if not path.exists():
+        pytest.skip(f"Du Fu extraction output not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {poem["poem_id"]: poem for poem in data["poems"]}
+
+
+@pytest.mark.integrity
+class TestExtractPoemData:
+    """Test annotation extraction from rebuilt Poem elements."""
+
+    @pytest.mark.parametrize("poem_id", STRAY_NOTE_POEM_IDS)
+    def test_notes_outside_title_and_lines_are_bucketed(self, poem_id, dufu_poems_by_id):
+        """
+        Test that notes outside Title/Jus still reach the type buckets.
+        
+        Args:
+            poem_id: Identifier of a poem with a stray note
+            dufu_poems_by_id: Committed poem records keyed by id
+        """
+        poem = dufu_poems_by_id[poem_id]
+        extracted = DuFuXMLExtractor._extract_poem_data(_build_poem_element(poem))
+        
+        assert extracted["text_annotations"][0] == poem["text_annotations"][0], \
+            f"Poem {poem_id} lost its note stored outside Title/Jus"
+        for key in ANNOTATION_BUCKETS.values():
+            assert extracted[key] == poem[key], \
+                f"Poem {poem_id} {key} differs from the committed output"
+
+    @pytest.mark.parametrize("poem_id", STRAY_NOTE_POEM_IDS)
+    def test_title_and_line_annotations_unchanged(self, poem_id, dufu_poems_by_id):
+        """
+        Test that stray notes are not attributed to the title or lines.
+        
+        Args:
+            poem_id: Identifier of a poem with a stray note
+            dufu_poems_by_id: Committed poem records keyed by id
+        """
+        poem = dufu_poems_by_id[poem_id]
+        extracted = DuFuXMLExtractor._extract_poem_data(_build_poem_element(poem))
+        
+        assert extracted["title_annotations"] == poem["title_annotations"]
+        assert extracted["line_annotations"] == poem["line_annotations"]
+    
+    def test_notes_in_extra_ns_or_outside_ns_are_bucketed(self):
+        """
+        Test that every N in the poem is bucketed, in document order.
+        
+        Covers a second Ns under Title and an N placed directly under a Ju,
+        neither of which belongs to the title or line annotations.
+        """
+        poem_elem = ET.fromstring(
+            '<Poem Id="1" AU="杜甫">'
+            '<Title C="t"><Ns><N T="Text" I="1">a</N></Ns>'
+            '<Ns><N T="Text" I="2">b</N></Ns></Title>'
+            '<Jus><Ju C="l"><N T="AllusionKey" I="3">c</N>'
+            '<Ns><N T="Text" I="4">d</N></Ns></Ju></Jus>'
+            '</Poem>')
+        extracted = DuFuXMLExtractor._extract_poem_data(poem_elem)
+        
+        assert extracted["text_annotations"] == [
+            {"index": "1", "content": "a"},
+            {"index": "2", "content": "b"},
+            {"index": "4", "content": "d"},
+        ]
+        assert extracted["allusion_key_annotations"] == [{"index": "3", "content": "c"}]
+
+
+@pytest.mark.integrity
+class TestPrescan:
+    """Test the byte-level pre-scan against the iterparse path."""
+    
+    def test_prescan_matches_iterparse(self, tmp_path):
+        """
+        Test that a descendant AU attribute does not select its poem.
+        
+        Args:
+            tmp_path: pytest temporary directory
+        """
+        xml_file = tmp_path / "writings.xml"
+        xml_file.write_text(
+            '<Poems>\n'
+            '<Poem Id="1" AU="李白"><As><A AU="杜甫">x</A></As></Poem>\n'
+            '<Poem Id="2" AU="杜甫"><Title C="a"/></Poem>\n'
+            '<Poem Id="3" AU="杜甫"/>\n'
+            '</Poems>\n', encoding="utf-8")
+        
+        def poem_ids(prescan):
+            extractor = DuFuXMLExtractor(str(xml_file), str(tmp_path / "out"))
+            elements = (extractor._iter_dufu_poems_prescan() if prescan
+                        else extractor._iter_dufu_poems_iterparse())
+            return [elem.get("Id") for elem in elements]
+        
+        assert poem_ids(prescan=True) == poem_ids(prescan=False) == ["2", "3"]
+    
+    def test_prescan_rejects_truncated_file(self, tmp_path):
+        """
+        Test that a poem without its closing tag raises a clear error.
+        
+        Args:
+            tmp_path: pytest temporary directory
+        """
+        xml_file = tmp_path / "writings.xml"
+        xml_file.write_text('<Poems><Poem Id="1" AU="杜甫"><Title C="a"/>',
+                            encoding="utf-8")
+        extractor = DuFuXMLExtractor(str(xml_file), str(tmp_path / "out"))
+        
+        with pytest.raises(ValueError, match="Truncated"):
+            list(extractor._iter_dufu_poems_prescan())
@@ -11,91 +11,144 @@ Test Categories:
     - Hierarchical identifier consistency
 """
 
-import json
+import re
 import pytest
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+from personas import MODERN_PERSONA_IDENTIFIERS
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+
+# ISO 8601 date or date-time, compiled once. Every optional group begins
+# with a literal separator, so a failed match cannot backtrack heavily
+_ISO8601 = re.compile(
+    r"^\d{4}(?:-\d{2}(?:-\d{2}(?:T\d{2}:\d{2}:\d{2}(?:\.\d+)?"
+    r"(?:[+-]\d{2}:\d{2}|Z)?)?)?)?$",
+    re.ASCII
+)
+
+# Temporal markers expected in a persona's era description
+_TEMPORAL_RE = re.compile(r"CE|present|Century|-")
+
+# snake_case identifier: lowercase letter, then lowercase letters, digits
+# or underscores (no spaces or special characters)
+_SNAKE_CASE = re.compile(r"[a-z][a-z0-9_]*")
+
+# Accepted quality_metrics.data_validation values
+VALIDATION_STATUSES = frozenset({"passed", "failed", "pending"})
+
+# DataCite resource type classifications accepted for personas
+VALID_RESOURCE_TYPES = frozenset({
+    "historical_poet",
+    "contemporary_entrepreneur",
+    "historical_monarch"
+})
+
+# JSON Schema for a persona entry in statistics.json (draft-07, the newest
+# draft fastjsonschema compiles)
+PERSONA_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": [
+        "display_name",
+        "type",
+        "language",
+        "era",
+        "documents",
+        "chunks",
+        "content"
+    ],
+    "properties": {
+        "documents": {
+            "type": "object",
+            "required": ["total"],
+            "properties": {"total": {"type": "integer", "minimum": 1}}
+        }
+    }
+}
+
+# PERSONA_SCHEMA's required fields, for a single set-difference check
+_REQUIRED_PERSONA_FIELDS = frozenset(PERSONA_SCHEMA["required"])
+
+# Persona validator generated once from PERSONA_SCHEMA when fastjsonschema
+# is installed
+_validate_persona = (
+    fastjsonschema.compile(PERSONA_SCHEMA) if fastjsonschema is not None else None
+)
 
 
 @pytest.mark.schema
 class TestMetadataFieldPresence:
     """Test suite for required metadata field validation."""
     
-    def test_persona_metadata_completeness(self, statistics_data: Dict[str, Any],
-                                          persona_identifiers: List[str]):
+    def test_persona_metadata_completeness(self, persona_record: Tuple[str, Dict[str, Any]]):
         """
-        Verify that each persona has all required metadata fields.
+        Verify that a persona's metadata matches PERSONA_SCHEMA.
+        
+        Covers the required fields and the document count (present,
+        integer, positive). Uses the compiled fastjsonschema validator when
+        available, otherwise equivalent direct checks that report every
+        violation at once.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
         """
-        personas = statistics_data["personas"]
+        persona_id, persona_data = persona_record
+        assert persona_data is not None, f"Persona '{persona_id}' missing from statistics"
         
-        required_fields = [
-            "display_name",
-            "type",
-            "language",
-            "era",
-            "documents",
-            "chunks",
-            "content"
+        if _validate_persona is not None:
+            try:
+                _validate_persona(persona_data)
+            except fastjsonschema.JsonSchemaException as e:
+                pytest.fail(f"Persona '{persona_id}' metadata invalid: {e.message}")
+            return
+        
+        errors = [
+            f"missing required field '{field}'"
+            for field in sorted(_REQUIRED_PERSONA_FIELDS - persona_data.keys())
         ]
         
-        for persona_id in persona_identifiers:
-            persona_data = personas[persona_id]
-            
-            for field in required_fields:
-                assert field in persona_data, \
-                    f"Persona '{persona_id}' missing required field: {field}"
-    
-    def test_document_counts_present(self, statistics_data: Dict[str, Any],
-                                    persona_identifiers: List[str]):
-        """
-        Verify that document count information is present for each persona.
+        documents = persona_data.get("documents", {})
+        if "total" not in documents:
+            errors.append("missing total document count")
+        elif not isinstance(documents["total"], int):
+            errors.append("document total must be integer")
+        elif documents["total"] <= 0:
+            errors.append("document total must be positive")
         
-        Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
-        """
-        personas = statistics_data["personas"]
-        
-        for persona_id in persona_identifiers:
-            documents = personas[persona_id]["documents"]
-            
-            assert "total" in documents, \
-                f"Persona '{persona_id}' missing total document count"
-            assert isinstance(documents["total"], int), \
-                f"Document total for '{persona_id}' must be integer"
-            assert documents["total"] > 0, \
-                f"Document total for '{persona_id}' must be positive"
+        assert not errors, \
+            f"Persona '{persona_id}' metadata invalid: " + "; ".join(errors)
 
 
 @pytest.mark.schema
 class TestISO639LanguageCodes:
     """Test suite for ISO 639-3 language code compliance."""
     
-    def test_language_codes_valid(self, statistics_data: Dict[str, Any],
-                                 persona_identifiers: List[str],
+    def test_language_codes_valid(self, persona_record: Tuple[str, Dict[str, Any]],
                                  iso_language_codes: Dict[str, str]):
         """
         Verify that language fields use valid ISO 639-3 codes.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
             iso_language_codes: Mapping of language names to ISO codes
         """
-        personas = statistics_data["personas"]
-        valid_codes = set(iso_language_codes.values())
+        persona_id, persona_data = persona_record
+        language = persona_data["language"]
         
-        for persona_id in persona_identifiers:
-            language = personas[persona_id]["language"]
-            
-            # Language field should map to valid ISO code
-            assert language in iso_language_codes, \
-                f"Persona '{persona_id}' has unmapped language: {language}"
+        # Language field should map to valid ISO code
+        assert language in iso_language_codes, \
+            f"Persona '{persona_id}' has unmapped language: {language}"
     
     def test_classical_chinese_code(self, statistics_data: Dict[str, Any]):
         """
@@ -117,13 +170,15 @@ class TestISO639LanguageCodes:
         Args:
             statistics_data: Loaded statistics data fixture
         """
-        modern_personas = ["elon_musk", "queen_elizabeth_ii"]
         personas = statistics_data["personas"]
         
-        for persona_id in modern_personas:
-            language = personas[persona_id]["language"]
-            assert language == "English", \
-                f"Persona '{persona_id}' should use 'English', got: {language}"
+        errors = [
+            f"'{persona_id}' uses {personas[persona_id]['language']!r}"
+            for persona_id in MODERN_PERSONA_IDENTIFIERS
+            if personas[persona_id]["language"] != "English"
+        ]
+        assert not errors, \
+            "Modern personas should use 'English': " + ", ".join(errors)
 
 
 @pytest.mark.schema
@@ -140,12 +195,17 @@ class TestISO8601Timestamps:
         if "generated_date" in statistics_data:
             date_str = statistics_data["generated_date"]
             
-            # Should parse as ISO 8601 datetime
-            try:
-                parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                assert parsed is not None
-            except ValueError as e:
-                pytest.fail(f"generated_date not in ISO 8601 format: {e}")
+            # Should be an ISO 8601 date-time
+            assert _ISO8601.match(date_str), \
+                f"generated_date not in ISO 8601 format: {date_str!r}"
+            
+            # Field ranges (month, day, hour, ...) are checked by parsing
+            # when the C parser is available; it accepts 'Z' natively
+            if ciso8601 is not None:
+                try:
+                    ciso8601.parse_datetime(date_str)
+                except ValueError as e:
+                    pytest.fail(f"generated_date not a valid ISO 8601 date: {e}")
 
 
 @pytest.mark.schema
@@ -159,14 +219,12 @@ class TestHierarchicalIdentifiers:
         Args:
             persona_identifiers: List of expected persona IDs
         """
-        for persona_id in persona_identifiers:
-            # Should be lowercase with underscores
-            assert persona_id.islower() or '_' in persona_id, \
-                f"Persona ID '{persona_id}' should use snake_case"
-            
-            # Should not contain spaces or special characters
-            assert ' ' not in persona_id, \
-                f"Persona ID '{persona_id}' should not contain spaces"
+        invalid = [
+            persona_id for persona_id in persona_identifiers
+            if not _SNAKE_CASE.fullmatch(persona_id)
+        ]
+        assert not invalid, \
+            f"Persona IDs should use snake_case: {invalid}"
     
     def test_display_name_format(self, statistics_data: Dict[str, Any],
                                 persona_display_names: Dict[str, str]):
@@ -190,20 +248,15 @@ class TestHierarchicalIdentifiers:
 class TestDublinCoreCompliance:
     """Test suite for Dublin Core metadata standard compliance."""
     
-    def test_creator_information(self, dataset_root: Path):
+    def test_creator_information(self, readme_bytes: bytes):
         """
         Verify that README contains Dublin Core creator information.
         
         Args:
-            dataset_root: Path fixture to dataset root
+            readme_bytes: Raw README.md contents fixture
         """
-        readme_path = dataset_root / "README.md"
-        
-        with open(readme_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         # Should contain citation or creator information
-        assert "Citation" in content or "Author" in content, \
+        assert b"Citation" in readme_bytes or b"Author" in readme_bytes, \
             "README should contain Dublin Core creator information"
     
     def test_dataset_identifier(self, statistics_data: Dict[str, Any]):
@@ -227,51 +280,39 @@ class TestDublinCoreCompliance:
 class TestDataCiteCompliance:
     """Test suite for DataCite metadata standard compliance."""
     
-    def test_resource_type_classification(self, statistics_data: Dict[str, Any],
-                                         persona_identifiers: List[str]):
+    def test_resource_type_classification(self, persona_record: Tuple[str, Dict[str, Any]]):
         """
         Verify that each persona has resource type classification.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
         """
-        personas = statistics_data["personas"]
-        
-        valid_types = [
-            "historical_poet",
-            "contemporary_entrepreneur",
-            "historical_monarch"
-        ]
-        
-        for persona_id in persona_identifiers:
-            resource_type = personas[persona_id]["type"]
-            assert resource_type in valid_types, \
-                f"Invalid resource type for '{persona_id}': {resource_type}"
+        persona_id, persona_data = persona_record
+        resource_type = persona_data["type"]
+        assert resource_type in VALID_RESOURCE_TYPES, \
+            f"Invalid resource type for '{persona_id}': {resource_type}"
     
-    def test_temporal_coverage(self, statistics_data: Dict[str, Any],
-                              persona_identifiers: List[str]):
+    def test_temporal_coverage(self, persona_record: Tuple[str, Dict[str, Any]]):
         """
         Verify that temporal coverage (era) is specified for each persona.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
         """
-        personas = statistics_data["personas"]
+        persona_id, persona_data = persona_record
+        era = persona_data["era"]
         
-        for persona_id in persona_identifiers:
-            era = personas[persona_id]["era"]
-            assert isinstance(era, str), \
-                f"Era for '{persona_id}' should be string"
-            assert len(era) > 0, \
-                f"Era for '{persona_id}' should not be empty"
-            
+        if not isinstance(era, str):
+            problem = "should be string"
+        elif not era:
+            problem = "should not be empty"
+        elif not _TEMPORAL_RE.search(era):
             # Should contain temporal information
-            has_temporal = any(marker in era for marker in 
-                             ["CE", "present", "Century", "-"])
-            assert has_temporal, \
-                f"Era for '{persona_id}' should contain temporal markers"
+            problem = "should contain temporal markers"
+        else:
+            problem = None
+        
+        assert problem is None, f"Era for '{persona_id}' {problem}: {era!r}"
 
 
 @pytest.mark.schema
@@ -312,7 +353,7 @@ class TestQualityMetricsSchema:
             "quality_metrics should include data_validation status"
         
         status = quality_metrics["data_validation"]
-        assert status in ["passed", "failed", "pending"], \
+        assert status in VALIDATION_STATUSES, \
             f"Invalid validation status: {status}"
 
 
@@ -320,40 +361,38 @@ class TestQualityMetricsSchema:
 class TestSchemaConsistency:
     """Test suite for cross-field schema consistency."""
     
-    def test_chunk_to_document_ratio(self, statistics_data: Dict[str, Any],
-                                    persona_identifiers: List[str]):
+    def test_chunk_to_document_ratio(self, persona_record: Tuple[str, Dict[str, Any]]):
         """
         Verify that chunk counts are consistent with document counts.
         
         Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_record: (persona_id, statistics entry) fixture
         """
-        personas = statistics_data["personas"]
+        persona_id, persona_data = persona_record
+        doc_count = persona_data["documents"]["total"]
+        chunk_count = persona_data["chunks"]["total"]
         
-        for persona_id in persona_identifiers:
-            persona_data = personas[persona_id]
-            doc_count = persona_data["documents"]["total"]
-            chunk_count = persona_data["chunks"]["total"]
-            
-            # Chunks should be >= documents (at least 1 chunk per document)
-            assert chunk_count >= doc_count, \
-                f"Persona '{persona_id}' has fewer chunks than documents: " \
-                f"{chunk_count} chunks, {doc_count} documents"
+        # Chunks should be >= documents (at least 1 chunk per document)
+        assert chunk_count >= doc_count, \
+            f"Persona '{persona_id}' has fewer chunks than documents: " \
+            f"{chunk_count} chunks, {doc_count} documents"
     
-    def test_overview_matches_persona_totals(self, statistics_data: Dict[str, Any]):
+    def test_overview_matches_persona_totals(self, statistics_data: Dict[str, Any],
+                                            persona_rows: List[tuple]):
         """
         Verify that overview totals match sum of persona-specific values.
         
         Args:
             statistics_data: Loaded statistics data fixture
+            persona_rows: Per-persona statistics sections fixture
         """
         overview = statistics_data["overview"]
-        personas = statistics_data["personas"]
         
-        # Calculate expected totals
-        expected_docs = sum(p["documents"]["total"] for p in personas.values())
-        expected_chunks = sum(p["chunks"]["total"] for p in personas.values())
+        # Calculate expected totals in a single pass
+        expected_docs = expected_chunks = 0
+        for _, _, documents, chunks, _ in persona_rows:
+            expected_docs += documents["total"]
+            expected_chunks += chunks["total"]
         
         # Verify totals match
         assert overview["total_documents"] == expected_docs, \
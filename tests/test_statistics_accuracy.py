@@ -5,158 +5,90 @@ This module validates that reported statistics in statistics.json accurately
 reflect the actual dataset contents.
 
 Test Categories:
-    - Document count verification
-    - Chunk count verification
+    - Document and chunk count verification
     - Content volume validation
     - Persona-specific metric accuracy
 """
 
-import json
 import pytest
 from pathlib import Path
 from typing import Dict, Any, List
 
+from personas import MODERN_PERSONA_IDENTIFIERS, PERSONA_IDENTIFIERS
 
-@pytest.mark.statistics
-class TestDocumentCounts:
-    """Test suite for document count accuracy."""
-    
-    def test_du_fu_document_count(self, statistics_data: Dict[str, Any],
-                                  expected_document_counts: Dict[str, int]):
-        """
-        Verify that Du Fu document count matches expected value.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            expected_document_counts: Expected counts fixture
-        """
-        actual_count = statistics_data["personas"]["du_fu"]["documents"]["total"]
-        expected_count = expected_document_counts["du_fu"]
-        
-        assert actual_count == expected_count, \
-            f"Du Fu document count mismatch: " \
-            f"expected {expected_count}, got {actual_count}"
-    
-    def test_elon_musk_document_count(self, statistics_data: Dict[str, Any],
-                                     expected_document_counts: Dict[str, int]):
-        """
-        Verify that Elon Musk document count matches expected value.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            expected_document_counts: Expected counts fixture
-        """
-        actual_count = statistics_data["personas"]["elon_musk"]["documents"]["total"]
-        expected_count = expected_document_counts["elon_musk"]
-        
-        assert actual_count == expected_count, \
-            f"Elon Musk document count mismatch: " \
-            f"expected {expected_count}, got {actual_count}"
-    
-    def test_queen_elizabeth_document_count(self, statistics_data: Dict[str, Any],
-                                           expected_document_counts: Dict[str, int]):
-        """
-        Verify that Queen Elizabeth II document count matches expected value.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            expected_document_counts: Expected counts fixture
-        """
-        actual_count = statistics_data["personas"]["queen_elizabeth_ii"]["documents"]["total"]
-        expected_count = expected_document_counts["queen_elizabeth_ii"]
-        
-        assert actual_count == expected_count, \
-            f"Queen Elizabeth II document count mismatch: " \
-            f"expected {expected_count}, got {actual_count}"
-    
-    def test_total_document_count(self, statistics_data: Dict[str, Any]):
-        """
-        Verify that total document count equals sum of persona counts.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-        """
-        overview_total = statistics_data["overview"]["total_documents"]
-        personas = statistics_data["personas"]
-        
-        calculated_total = sum(
-            p["documents"]["total"] for p in personas.values()
-        )
-        
-        assert overview_total == calculated_total, \
-            f"Total document count mismatch: " \
-            f"overview shows {overview_total}, " \
-            f"persona sum is {calculated_total}"
+
+# Count sections and the fixture holding their expected per-persona values
+COUNT_KINDS = [
+    ("documents", "expected_document_counts"),
+    ("chunks", "expected_chunk_counts"),
+]
+
+# Count sections and their overview total key
+TOTAL_KINDS = [
+    ("documents", "total_documents"),
+    ("chunks", "total_chunks"),
+]
+
+# Numeric statistics checks: (persona_id, dotted path in the persona entry,
+# required type, inclusive low, inclusive high or None)
+NUMERIC_RANGES = (
+    # Content volume must be a positive integer
+    [(persona_id, "content.total_words", int, 1, None) for persona_id in PERSONA_IDENTIFIERS]
+    # Average chunk size: between 1 and 10000 words/chars
+    + [(persona_id, "content.average_words_per_chunk", (int, float), 1, 10000)
+       for persona_id in PERSONA_IDENTIFIERS]
+    # English chunks typically range from 10 to 5000 words
+    + [(persona_id, "content.average_words_per_chunk", (int, float), 10, 5000)
+       for persona_id in MODERN_PERSONA_IDENTIFIERS]
+)
 
 
 @pytest.mark.statistics
-class TestChunkCounts:
-    """Test suite for chunk count accuracy."""
-    
-    def test_du_fu_chunk_count(self, statistics_data: Dict[str, Any],
-                              expected_chunk_counts: Dict[str, int]):
-        """
-        Verify that Du Fu chunk count matches expected value.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            expected_chunk_counts: Expected counts fixture
-        """
-        actual_count = statistics_data["personas"]["du_fu"]["chunks"]["total"]
-        expected_count = expected_chunk_counts["du_fu"]
-        
-        assert actual_count == expected_count, \
-            f"Du Fu chunk count mismatch: " \
-            f"expected {expected_count}, got {actual_count}"
-    
-    def test_elon_musk_chunk_count(self, statistics_data: Dict[str, Any],
-                                  expected_chunk_counts: Dict[str, int]):
-        """
-        Verify that Elon Musk chunk count matches expected value.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            expected_chunk_counts: Expected counts fixture
-        """
-        actual_count = statistics_data["personas"]["elon_musk"]["chunks"]["total"]
-        expected_count = expected_chunk_counts["elon_musk"]
-        
-        assert actual_count == expected_count, \
-            f"Elon Musk chunk count mismatch: " \
-            f"expected {expected_count}, got {actual_count}"
+class TestCounts:
+    """Test suite for document and chunk count accuracy."""
     
-    def test_queen_elizabeth_chunk_count(self, statistics_data: Dict[str, Any],
-                                        expected_chunk_counts: Dict[str, int]):
+    @pytest.mark.parametrize("kind, expected_fixture", COUNT_KINDS)
+    @pytest.mark.parametrize("persona_id", PERSONA_IDENTIFIERS)
+    def test_persona_count(self, persona_id: str, kind: str,
+                           expected_fixture: str,
+                           statistics_data: Dict[str, Any],
+                           request: pytest.FixtureRequest):
         """
-        Verify that Queen Elizabeth II chunk count matches expected value.
+        Verify that each persona's document or chunk count matches expected value.
         
         Args:
+            persona_id: Persona identifier
+            kind: Statistics section to check ("documents" or "chunks")
+            expected_fixture: Name of the expected counts fixture for kind
             statistics_data: Loaded statistics data fixture
-            expected_chunk_counts: Expected counts fixture
+            request: Pytest fixture request, used to resolve expected_fixture
         """
-        actual_count = statistics_data["personas"]["queen_elizabeth_ii"]["chunks"]["total"]
-        expected_count = expected_chunk_counts["queen_elizabeth_ii"]
+        actual_count = statistics_data["personas"][persona_id][kind]["total"]
+        expected_count = request.getfixturevalue(expected_fixture)[persona_id]
         
         assert actual_count == expected_count, \
-            f"Queen Elizabeth II chunk count mismatch: " \
+            f"{persona_id} {kind} count mismatch: " \
             f"expected {expected_count}, got {actual_count}"
     
-    def test_total_chunk_count(self, statistics_data: Dict[str, Any]):
+    @pytest.mark.parametrize("kind, overview_key", TOTAL_KINDS)
+    def test_total_count(self, kind: str, overview_key: str,
+                         statistics_data: Dict[str, Any],
+                         persona_rows: List[tuple]):
         """
-        Verify that total chunk count equals sum of persona counts.
+        Verify that an overview total equals the sum of persona counts.
         
         Args:
+            kind: Statistics section being totalled ("documents" or "chunks")
+            overview_key: Matching key in the overview section
             statistics_data: Loaded statistics data fixture
+            persona_rows: Per-persona statistics sections fixture
         """
-        overview_total = statistics_data["overview"]["total_chunks"]
-        personas = statistics_data["personas"]
+        overview_total = statistics_data["overview"][overview_key]
         
-        calculated_total = sum(
-            p["chunks"]["total"] for p in personas.values()
-        )
+        calculated_total = sum([persona[kind]["total"] for _, persona, *_ in persona_rows])
         
         assert overview_total == calculated_total, \
-            f"Total chunk count mismatch: " \
+            f"Total {kind} count mismatch: " \
             f"overview shows {overview_total}, " \
             f"persona sum is {calculated_total}"
 
@@ -165,46 +97,34 @@ class TestChunkCounts:
 class TestContentVolume:
     """Test suite for content volume metrics."""
     
-    def test_content_volume_positive(self, statistics_data: Dict[str, Any],
-                                    persona_identifiers: List[str]):
+    @pytest.mark.parametrize(
+        "persona_id, path, number_type, low, high", NUMERIC_RANGES,
+        ids=[f"{persona_id}-{path}-{low}-{high}" for persona_id, path, _, low, high in NUMERIC_RANGES]
+    )
+    def test_statistic_within_range(self, statistics_data: Dict[str, Any],
+                                    persona_id: str, path: str,
+                                    number_type: type, low: float, high: float):
         """
-        Verify that all personas have positive content volume.
+        Verify that a persona statistic has the expected type and range.
         
         Args:
             statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
+            persona_id: Persona identifier
+            path: Dotted path of the statistic within the persona entry
+            number_type: Required type of the value
+            low: Inclusive lower bound
+            high: Inclusive upper bound (None for unbounded)
         """
-        personas = statistics_data["personas"]
+        value = statistics_data["personas"][persona_id]
+        for key in path.split("."):
+            assert key in value, \
+                f"Persona '{persona_id}' missing {path} field"
+            value = value[key]
         
-        for persona_id in persona_identifiers:
-            total_words = personas[persona_id]["content"]["total_words"]
-            
-            assert total_words > 0, \
-                f"Persona '{persona_id}' has zero or negative content volume"
-            assert isinstance(total_words, int), \
-                f"Content volume for '{persona_id}' must be integer"
-    
-    def test_average_chunk_size_reasonable(self, statistics_data: Dict[str, Any],
-                                          persona_identifiers: List[str]):
-        """
-        Verify that average chunk sizes are within reasonable ranges.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-            persona_identifiers: List of expected persona IDs
-        """
-        personas = statistics_data["personas"]
-        
-        for persona_id in persona_identifiers:
-            avg_size = personas[persona_id]["content"]["average_words_per_chunk"]
-            
-            # Average chunk size should be positive
-            assert avg_size > 0, \
-                f"Persona '{persona_id}' has non-positive average chunk size"
-            
-            # Should be reasonable (between 1 and 10000 words/chars)
-            assert 1 <= avg_size <= 10000, \
-                f"Persona '{persona_id}' has unreasonable average chunk size: {avg_size}"
+        assert isinstance(value, number_type), \
+            f"{path} for '{persona_id}' has unexpected type: {value!r}"
+        assert value >= low and (high is None or value <= high), \
+            f"Persona '{persona_id}' has out-of-range {path}: {value}"
 
 
 @pytest.mark.statistics
@@ -228,44 +148,19 @@ class TestPersonaSpecificMetrics:
         note = du_fu["content"].get("note", "")
         assert "character" in note.lower() or "Character" in note, \
             "Du Fu content should note character-based counting"
-    
-    def test_modern_personas_word_based(self, statistics_data: Dict[str, Any]):
-        """
-        Verify that modern personas use word-based counting.
-        
-        Args:
-            statistics_data: Loaded statistics data fixture
-        """
-        modern_personas = ["elon_musk", "queen_elizabeth_ii"]
-        personas = statistics_data["personas"]
-        
-        for persona_id in modern_personas:
-            content = personas[persona_id]["content"]
-            
-            # Should have "total_words" field
-            assert "total_words" in content, \
-                f"Persona '{persona_id}' missing total_words field"
-            
-            # Average should be reasonable for English text
-            avg = content["average_words_per_chunk"]
-            # English chunks typically range from 10 to 5000 words
-            assert 10 <= avg <= 5000, \
-                f"Persona '{persona_id}' has unusual word count average: {avg}"
 
 
 @pytest.mark.statistics
 class TestDistributionMetrics:
     """Test suite for distribution metrics validation."""
     
-    def test_language_distribution_exists(self, statistics_data: Dict[str, Any]):
+    def test_language_distribution_exists(self, distribution: Dict[str, Any]):
         """
         Verify that language distribution is documented.
         
         Args:
-            statistics_data: Loaded statistics data fixture
+            distribution: Statistics distribution section fixture
         """
-        distribution = statistics_data.get("distribution", {})
-        
         assert "by_language" in distribution, \
             "Distribution should include by_language breakdown"
         
@@ -275,15 +170,13 @@ class TestDistributionMetrics:
         assert "English" in by_language, \
             "Distribution should include English"
     
-    def test_era_distribution_exists(self, statistics_data: Dict[str, Any]):
+    def test_era_distribution_exists(self, distribution: Dict[str, Any]):
         """
         Verify that temporal era distribution is documented.
         
         Args:
-            statistics_data: Loaded statistics data fixture
+            distribution: Statistics distribution section fixture
         """
-        distribution = statistics_data.get("distribution", {})
-        
         assert "by_era" in distribution, \
             "Distribution should include by_era breakdown"
         
@@ -292,17 +185,14 @@ class TestDistributionMetrics:
         assert len(by_era) >= 2, \
             "Distribution should include multiple eras"
     
-    def test_distribution_percentages_valid(self, statistics_data: Dict[str, Any]):
+    def test_distribution_percentages_valid(self, distribution: Dict[str, Any]):
         """
         Verify that distribution percentages are valid.
         
         Args:
-            statistics_data: Loaded statistics data fixture
+            distribution: Statistics distribution section fixture
         """
-        distribution = statistics_data.get("distribution", {})
-        by_language = distribution.get("by_language", {})
-        
-        for language, data in by_language.items():
+        for language, data in distribution["by_language"].items():
             if "percentage" in data:
                 percentage = data["percentage"]
                 
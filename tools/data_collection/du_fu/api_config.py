@@ -12,6 +12,22 @@ import json
 from pathlib import Path
 from typing import Dict, Optional
 
+# urllib3 decodes brotli responses only when a brotli package is installed
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Compressed response encodings this client can decode
+ACCEPT_ENCODING = "gzip, br" if brotli is not None else "gzip"
+
+# Root of the collectors' on-disk HTTP response caches; kept next to the
+# scripts (and gitignored) rather than inside the published datasets tree
+HTTP_CACHE_DIR = Path(__file__).resolve().parent / "http_cache"
+
 
 class APIConfig:
     """
@@ -48,11 +64,19 @@ class APIConfig:
             "timeout": 30,
             "retry_attempts": 3,
             "retry_delay": 2,
+            "retry_delay_cap": 60,
+            "pool_connections": 8,
+            "pool_maxsize": 32,
             "headers": {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+                "Accept-Encoding": ACCEPT_ENCODING
             }
         }
         
+        # Formatted Du Fu poems base URLs, keyed by writing type (None for
+        # all types); built on first use, cleared when config is reloaded
+        self._du_fu_poems_base = {}
+        
         if config_file and Path(config_file).exists():
             self._load_config(config_file)
     
@@ -74,6 +98,8 @@ class APIConfig:
         
         if "request_config" in config:
             self.request_config.update(config["request_config"])
+        
+        self._du_fu_poems_base.clear()
     
     def get_url(self, endpoint_key: str, **kwargs) -> str:
         """
@@ -97,6 +123,9 @@ class APIConfig:
         """
         Get URL for Du Fu's poems.
         
+        The endpoint is formatted once per writing type and reused, since
+        the paging loop requests it for every page.
+        
         Args:
             writing_type: Optional writing type filter (e.g., "詩")
             page_no: Page number (default 0)
@@ -104,15 +133,19 @@ class APIConfig:
         Returns:
             Full URL with query parameters
         """
-        params = self.du_fu_params.copy()
-        
-        if writing_type:
-            endpoint_key = "writing_by_author_type"
-            params["writingType"] = writing_type
-        else:
-            endpoint_key = "writing_by_author"
+        base_url = self._du_fu_poems_base.get(writing_type)
         
-        base_url = self.get_url(endpoint_key, **params)
+        if base_url is None:
+            params = self.du_fu_params.copy()
+            
+            if writing_type:
+                endpoint_key = "writing_by_author_type"
+                params["writingType"] = writing_type
+            else:
+                endpoint_key = "writing_by_author"
+            
+            base_url = self.get_url(endpoint_key, **params)
+            self._du_fu_poems_base[writing_type] = base_url
         
         if page_no > 0:
             return f"{base_url}?pageNo={page_no}"
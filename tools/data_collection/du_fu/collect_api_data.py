@@ -8,16 +8,83 @@ Author: Living Voices Project
 Date: 2024-10-04
 """
 
+import hashlib
 import json
 import os
+import random
 import sys
 import time
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, Optional
 
 import requests
-from api_config import APIConfig
+from requests.adapters import HTTPAdapter
+from api_config import APIConfig, HTTP_CACHE_DIR
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parses a JSON document from bytes (orjson when installed)
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dump_compact(obj, path: Path):
+    """
+    Write obj to path as compact UTF-8 JSON.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library with identical (compact, non-ASCII preserving) output.
+    
+    Args:
+        obj: JSON-serialisable data
+        path: Output file path
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps_line(obj) -> bytes:
+    """
+    Serialise obj as one compact UTF-8 JSON line.
+    
+    Args:
+        obj: JSON-serialisable data
+        
+    Returns:
+        JSON bytes followed by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+
+
+def _has_records(data) -> bool:
+    """
+    Check whether a parsed API response carries any records.
+    
+    Follows collect_poems: a dict page holds its records under "items" or
+    "data", anything else is a bare list (or other value).
+    
+    Args:
+        data: Parsed JSON response
+        
+    Returns:
+        True unless the response is empty
+    """
+    if isinstance(data, dict):
+        for key in ("items", "data"):
+            if key in data:
+                return bool(data[key])
+    return bool(data)
 
 
 class DuFuDataCollector:
@@ -25,19 +92,24 @@ class DuFuDataCollector:
     Collector for Du Fu's poetry and biographical data from API.
     """
     
-    def __init__(self, output_dir: str, config: Optional[APIConfig] = None):
+    def __init__(self, output_dir: str, config: Optional[APIConfig] = None,
+                 force_refresh: bool = False, cache_dir: Optional[str] = None):
         """
         Initialize the collector.
         
         Args:
             output_dir: Directory to save collected data
             config: Optional API configuration instance
+            force_refresh: Re-download responses even when cached
+            cache_dir: Directory for cached API responses (defaults to
+                HTTP_CACHE_DIR/tang_song_api, outside the datasets tree)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.poems_dir = self.output_dir / "api_data" / "poems"
         self.poems_dir.mkdir(parents=True, exist_ok=True)
+        self.poems_file = self.poems_dir / "poems.jsonl"
         
         self.biography_dir = self.output_dir / "api_data" / "biography"
         self.biography_dir.mkdir(parents=True, exist_ok=True)
@@ -45,115 +117,273 @@ class DuFuDataCollector:
         self.metadata_dir = self.output_dir / "metadata"
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
         
+        # Successful API responses, keyed by URL, so reruns skip requests
+        # already answered
+        self.cache_dir = Path(cache_dir) if cache_dir else HTTP_CACHE_DIR / "tang_song_api"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.force_refresh = force_refresh
+        
         self.config = config or APIConfig()
         self.session = requests.Session()
         self.session.headers.update(self.config.request_config["headers"])
         
+        # Bounded keep-alive pool: threads wait for a free connection rather
+        # than opening and discarding extra ones. Retries are handled by
+        # _make_request, so the adapter itself does not retry.
+        adapter = HTTPAdapter(
+            pool_connections=self.config.request_config["pool_connections"],
+            pool_maxsize=self.config.request_config["pool_maxsize"],
+            max_retries=0,
+            pool_block=True
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
         self.collection_log = []
         
-    def _make_request(self, url: str, retry_count: int = 0) -> Optional[Dict]:
+        # Running (exponentially weighted) rate of throttled responses
+        # (429/5xx); raises the backoff base while the server is struggling
+        self.throttle_rate = 0.0
+        
+    def _make_request(self, url: str) -> Optional[Dict]:
         """
         Make HTTP request with retry logic.
         
+        Responses cached by an earlier run are returned without a request;
+        empty responses are never cached.
+        Failed attempts are retried after the server's Retry-After delay
+        when given (429/503), otherwise after an exponential backoff with
+        jitter whose base grows with the observed throttle rate.
+        
         Args:
             url: URL to request
-            retry_count: Current retry attempt number
             
         Returns:
             JSON response data or None if failed
         """
-        max_retries = self.config.request_config["retry_attempts"]
-        timeout = self.config.request_config["timeout"]
+        cache_file = self._cache_file(url)
+        if self._is_cached(url):
+            print(f"  Cached: {url}")
+            return _loads(cache_file.read_bytes())
+        
+        request_config = self.config.request_config
+        max_retries = request_config["retry_attempts"]
+        timeout = request_config["timeout"]
+        
+        for attempt in range(max_retries + 1):
+            response = None
+            try:
+                print(f"  Requesting: {url}")
+                response = self.session.get(url, timeout=timeout)
+                self._record_throttle(response.status_code)
+                response.raise_for_status()
+                data = _loads(response.content)
+                
+                # Empty pages end the pagination; leaving them uncached lets
+                # a rerun pick up pages added since. Write then rename, so an
+                # interrupted run never leaves a partial entry
+                if _has_records(data):
+                    tmp_file = cache_file.with_suffix(".tmp")
+                    tmp_file.write_bytes(response.content)
+                    tmp_file.replace(cache_file)
+                
+                return data
+                
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # ValueError covers a body that is not valid JSON (e.g. a
+                # truncated response or an HTML error page served with 200)
+                print(f"    Error: {e}")
+            
+            if attempt == max_retries:
+                print(f"    Failed after {max_retries} attempts")
+                return None
+            
+            delay = self._retry_after(response)
+            if delay is None:
+                base = request_config["retry_delay"] * (1 + self.throttle_rate)
+                delay = min(request_config["retry_delay_cap"], base * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.5)
+            
+            print(f"    Retrying in {delay:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    
+    def _cache_file(self, url: str) -> Path:
+        """
+        Get the cache file for a URL.
         
-        try:
-            print(f"  Requesting: {url}")
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
+        Args:
+            url: Request URL
             
-            return response.json()
+        Returns:
+            Path of the cached response body
+        """
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+    
+    def _is_cached(self, url: str) -> bool:
+        """
+        Check whether a URL's response will be served from the cache.
+        
+        Args:
+            url: Request URL
             
-        except requests.exceptions.RequestException as e:
-            print(f"    Error: {e}")
+        Returns:
+            True if a cached response exists and force_refresh is off
+        """
+        return not self.force_refresh and self._cache_file(url).exists()
+    
+    def _record_throttle(self, status_code: int, weight: float = 0.2):
+        """
+        Fold one response into the running throttle rate.
+        
+        Args:
+            status_code: HTTP status code of the response
+            weight: Weight of the newest observation
+        """
+        throttled = status_code == 429 or status_code >= 500
+        self.throttle_rate += weight * (throttled - self.throttle_rate)
+    
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """
+        Read the delay a 429/503 response asks for in its Retry-After header.
+        
+        Args:
+            response: Response of the failed attempt, or None
             
-            if retry_count < max_retries:
-                delay = self.config.request_config["retry_delay"] * (retry_count + 1)
-                print(f"    Retrying in {delay} seconds... (Attempt {retry_count + 1}/{max_retries})")
-                time.sleep(delay)
-                return self._make_request(url, retry_count + 1)
-            else:
-                print(f"    Failed after {max_retries} attempts")
-                return None
+        Returns:
+            Delay in seconds, or None if the response gives none
+        """
+        if response is None or response.status_code not in (429, 503):
+            return None
+        
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        # HTTP-date form
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
     
-    def collect_poems(self, max_pages: Optional[int] = None) -> List[Dict]:
+    def collect_poems(self, max_pages: Optional[int] = None) -> int:
         """
         Collect Du Fu's poems from API with pagination.
         
+        Each page's poems are appended to poems.jsonl as they arrive, so
+        only one page is held in memory at a time. The next page is fetched
+        in a background thread while the current one is written.
+        
         Args:
             max_pages: Optional maximum number of pages to collect
             
         Returns:
-            List of collected poems
+            Number of poems collected
         """
         print("Collecting Du Fu's poems from API...")
         print("=" * 70)
         
-        all_poems = []
+        total_poems = 0
         page_no = 0
         
-        while True:
-            if max_pages and page_no >= max_pages:
-                print(f"\nReached maximum page limit: {max_pages}")
-                break
-            
-            print(f"\nPage {page_no}:")
-            url = self.config.get_du_fu_poems_url(page_no=page_no)
+        with ThreadPoolExecutor(max_workers=1) as prefetcher, \
+                open(self.poems_file, 'wb', buffering=1 << 20) as poems_out:
+            next_page = prefetcher.submit(self._fetch_poems_page, page_no)
             
-            data = self._make_request(url)
-            
-            if not data:
-                print(f"  No data returned for page {page_no}")
-                break
-            
-            if not isinstance(data, list):
-                if isinstance(data, dict) and "items" in data:
-                    poems = data["items"]
-                elif isinstance(data, dict) and "data" in data:
-                    poems = data["data"]
+            while True:
+                if max_pages and page_no >= max_pages:
+                    print(f"\nReached maximum page limit: {max_pages}")
+                    break
+                
+                print(f"\nPage {page_no}:")
+                url, data = next_page.result()
+                
+                if not data:
+                    print(f"  No data returned for page {page_no}")
+                    break
+                
+                if not isinstance(data, list):
+                    if isinstance(data, dict) and "items" in data:
+                        poems = data["items"]
+                    elif isinstance(data, dict) and "data" in data:
+                        poems = data["data"]
+                    else:
+                        print(f"  Unexpected data format: {type(data)}")
+                        break
                 else:
-                    print(f"  Unexpected data format: {type(data)}")
+                    poems = data
+                
+                if not poems:
+                    print(f"  No more poems found (empty response)")
                     break
-            else:
-                poems = data
-            
-            if not poems:
-                print(f"  No more poems found (empty response)")
-                break
-            
-            print(f"  Collected {len(poems)} poems")
-            all_poems.extend(poems)
-            
-            page_file = self.poems_dir / f"poems_page_{page_no}.json"
-            with open(page_file, 'w', encoding='utf-8') as f:
-                json.dump(poems, f, ensure_ascii=False, indent=2)
-            
-            self.collection_log.append({
-                "type": "poems",
-                "page": page_no,
-                "count": len(poems),
-                "file": str(page_file),
-                "url": url,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            page_no += 1
-            
-            time.sleep(1)
+                
+                print(f"  Collected {len(poems)} poems")
+                total_poems += len(poems)
+                
+                # Overlap the next request with writing this page
+                if not (max_pages and page_no + 1 >= max_pages):
+                    next_page = prefetcher.submit(self._fetch_poems_page, page_no + 1)
+                
+                for poem in poems:
+                    poems_out.write(_dumps_line(poem))
+                
+                self.collection_log.append({
+                    "type": "poems",
+                    "page": page_no,
+                    "count": len(poems),
+                    "file": str(self.poems_file),
+                    "url": url,
+                    "timestamp": datetime.now().isoformat()
+                })
+                
+                page_no += 1
         
         print(f"\n{'=' * 70}")
-        print(f"Total poems collected: {len(all_poems)}")
+        print(f"Total poems collected: {total_poems}")
         print(f"Total pages: {page_no}")
         
-        return all_poems
+        return total_poems
+    
+    def _fetch_poems_page(self, page_no: int):
+        """
+        Fetch one page of poems, then pause before returning.
+        
+        Runs on the prefetch thread; the pause keeps consecutive requests
+        spaced out without delaying the main thread's writing. Pages served
+        from the cache are returned without a pause.
+        
+        Args:
+            page_no: Page number to fetch
+            
+        Returns:
+            Tuple of (url, response data or None)
+        """
+        url = self.config.get_du_fu_poems_url(page_no=page_no)
+        cached = self._is_cached(url)
+        data = self._make_request(url)
+        if not cached:
+            time.sleep(1)  # Rate limiting
+        return url, data
+    
+    def iter_poems(self) -> Iterator[Dict]:
+        """
+        Iterate over the collected poems without loading them all at once.
+        
+        Yields:
+            Poem dictionaries, in collection order
+        """
+        with open(self.poems_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
     
     def collect_biography(self) -> Optional[Dict]:
         """
@@ -169,8 +399,7 @@ class DuFuDataCollector:
         
         if data:
             bio_file = self.biography_dir / "dufu_biography.json"
-            with open(bio_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            _dump_compact(data, bio_file)
             
             print(f"  Saved biography to: {bio_file}")
             
@@ -200,39 +429,43 @@ class DuFuDataCollector:
         
         print(f"\nCollection log saved to: {log_file}")
     
-    def generate_summary(self, poems: List[Dict]) -> Dict:
+    def generate_summary(self, poems: Iterable[Dict]) -> Dict:
         """
         Generate collection summary statistics.
         
         Args:
-            poems: List of collected poems
+            poems: Collected poems; any iterable, consumed in a single pass
+                (e.g. iter_poems())
             
         Returns:
             Summary statistics dictionary
         """
-        total_poems = len(poems)
+        total_poems = 0
+        poems_with_dates = 0
+        poems_with_places = 0
+        poem_types = Counter()
+        total_chars = 0
         
-        poems_with_dates = [p for p in poems if p.get("creation_date_raw")]
-        poems_with_places = [p for p in poems if p.get("place_code")]
-        
-        poem_types = {}
         for poem in poems:
-            ptype = poem.get("poem_type", "Unknown")
-            poem_types[ptype] = poem_types.get(ptype, 0) + 1
-        
-        total_chars = sum(
-            len(''.join(p.get("poem_content_lines", []))) 
-            for p in poems
-        )
+            total_poems += 1
+            if poem.get("creation_date_raw"):
+                poems_with_dates += 1
+            if poem.get("place_code"):
+                poems_with_places += 1
+            
+            poem_types[poem.get("poem_type", "Unknown")] += 1
+            
+            # Sum line lengths rather than joining the lines into a new string
+            total_chars += sum(map(len, poem.get("poem_content_lines", ())))
         
         estimated_tokens = int(total_chars * 1.3)
         
         summary = {
             "collection_date": datetime.now().isoformat(),
             "total_poems": total_poems,
-            "poems_with_dates": len(poems_with_dates),
-            "poems_with_places": len(poems_with_places),
-            "poem_types": poem_types,
+            "poems_with_dates": poems_with_dates,
+            "poems_with_places": poems_with_places,
+            "poem_types": dict(poem_types),
             "statistics": {
                 "total_characters": total_chars,
                 "estimated_tokens": estimated_tokens,
@@ -299,13 +532,13 @@ def main():
     config = APIConfig()
     collector = DuFuDataCollector(str(output_dir), config)
     
-    poems = collector.collect_poems(max_pages=None)
+    poem_count = collector.collect_poems(max_pages=None)
     
-    if poems:
+    if poem_count:
         collector.collect_biography()
         collector.save_collection_log()
         
-        summary = collector.generate_summary(poems)
+        summary = collector.generate_summary(collector.iter_poems())
         collector.print_summary(summary)
         
         print(f"\nData collection completed successfully!")
@@ -9,11 +9,115 @@ Date: 2025-10-04
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import re
 import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlencode
 import os
 
+from api_config import ACCEPT_ENCODING, HTTP_CACHE_DIR
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parses a JSON document from bytes (orjson when installed)
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Concurrent article fetches, and the global request rate they share
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 4
+
+# Wikimedia APIs ask clients to identify themselves
+USER_AGENT = "LivingVoicesDataset/1.0 (Du Fu supplementary data collection)"
+
+
+def _dump_compact(obj, path):
+    """
+    Write obj to path as compact UTF-8 JSON.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library with identical (compact, non-ASCII preserving) output.
+    
+    Args:
+        obj: JSON-serialisable data
+        path: Output file path
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def _has_records(data):
+    """
+    Check whether a parsed MediaWiki or Wikidata response has a usable page.
+    
+    Missing or invalid pages (e.g. the "-1" page id), pages with an empty
+    extract, and missing Wikidata entities do not count.
+    
+    Args:
+        data: Parsed JSON response
+        
+    Returns:
+        True if at least one page or entity carries data
+    """
+    if not isinstance(data, dict):
+        return bool(data)
+    
+    pages = data.get('query', {}).get('pages')
+    if pages is not None:
+        return any(
+            page_id != '-1' and 'missing' not in page and 'invalid' not in page
+            and page.get('extract')
+            for page_id, page in pages.items()
+        )
+    
+    entities = data.get('entities')
+    if entities is not None:
+        return any('missing' not in entity for entity in entities.values())
+    
+    return bool(data)
+
+
+class RateLimiter:
+    """
+    Spaces request starts evenly to cap the global request rate across
+    threads.
+    """
+    
+    def __init__(self, requests_per_second):
+        """
+        Initialize the limiter.
+        
+        Args:
+            requests_per_second: Maximum number of requests started per second
+        """
+        self.interval = 1.0 / requests_per_second
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """
+        Block until the calling thread may start its next request.
+        """
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class DuFuWikipediaCollector:
     """
@@ -21,12 +125,15 @@ class DuFuWikipediaCollector:
     Focuses on biographical, historical, and cultural context.
     """
     
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, force_refresh=False, cache_dir=None):
         """
         Initialize the collector.
         
         Args:
             output_dir: Directory for output files
+            force_refresh: Re-download responses even when cached
+            cache_dir: Directory for cached API responses (defaults to
+                HTTP_CACHE_DIR/wikipedia, outside the datasets tree)
         """
         self.output_dir = output_dir
         self.wikipedia_base = "https://en.wikipedia.org/w/api.php"
@@ -38,10 +145,90 @@ class DuFuWikipediaCollector:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
+        # Successful API responses, keyed by request, so reruns skip
+        # requests already answered
+        self.cache_dir = cache_dir or os.path.join(HTTP_CACHE_DIR, 'wikipedia')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.force_refresh = force_refresh
+        
+        # Article texts are written here as they arrive; the collected
+        # records only point to them
+        self.articles_dir = os.path.join(output_dir, 'articles')
+        os.makedirs(self.articles_dir, exist_ok=True)
+        
         # Storage for collected data
         self.wikipedia_data = {}
         self.wikidata_data = {}
         self.related_articles = []
+        
+        # Shared by all fetch threads (replaces the per-article sleep)
+        self.rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+        
+        # One session for all calls, so connections are kept alive and
+        # reused; one pool per host (en/zh Wikipedia, Wikidata), each large
+        # enough for every fetch thread
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+    
+    def _cached_get(self, url, params):
+        """
+        GET a JSON API response, served from the on-disk cache when present.
+        
+        Only successful responses with a usable page are cached (see
+        _has_records), so a title that is missing or empty is asked for
+        again on the next run. Errors propagate to the caller as before,
+        with a body that is not valid JSON raised as requests'
+        InvalidJSONError.
+        
+        Args:
+            url: API endpoint URL
+            params: Query parameters
+            
+        Returns:
+            Parsed JSON response
+        """
+        key = hashlib.sha1(f"{url}?{urlencode(sorted(params.items()))}".encode('utf-8')).hexdigest()
+        cache_file = os.path.join(self.cache_dir, f"{key}.json")
+        
+        if not self.force_refresh and os.path.exists(cache_file):
+            with open(cache_file, 'rb') as f:
+                return _loads(f.read())
+        
+        self.rate_limiter.wait()
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        try:
+            data = _loads(response.content)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(
+                f"Invalid JSON in response from {response.url}: {e}",
+                response=response) from e
+        
+        # Write then rename, so an interrupted run never leaves a partial entry
+        if _has_records(data):
+            tmp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(response.content)
+            os.replace(tmp_file, cache_file)
+        
+        return data
+    
+    def close(self):
+        """
+        Close the HTTP session and its pooled connections.
+        """
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def collect_all(self):
         """
@@ -90,25 +277,72 @@ class DuFuWikipediaCollector:
             }
         ]
         
-        for article in articles_to_collect:
+        stored = self._fetch_articles(
+            [(article['lang'], article['title']) for article in articles_to_collect]
+        )
+        
+        for article, text_info in zip(articles_to_collect, stored):
             print(f"  Collecting: {article['title']} ({article['lang']})")
             
-            # Get article content
-            content = self._get_wikipedia_article(article['lang'], article['title'])
-            
-            if content:
+            if text_info:
                 self.wikipedia_data[f"{article['lang']}_{article['title']}"] = {
                     'language': article['lang'],
                     'title': article['title'],
                     'description': article['description'],
-                    'content': content,
+                    **text_info,
                     'collected': datetime.now().isoformat()
                 }
-                print(f"    ✓ Collected: {len(content)} characters")
+                print(f"    ✓ Collected: {text_info['char_count']} characters")
             else:
                 print(f"    ✗ Failed to collect")
+    
+    def _fetch_articles(self, articles):
+        """
+        Fetch several Wikipedia articles concurrently.
+        
+        Each text is written to articles_dir as soon as it arrives (see
+        _store_article).
+        
+        Args:
+            articles: List of (lang, title) tuples
             
-            time.sleep(1)  # Rate limiting
+        Returns:
+            List of stored text records (None for failures), in input order
+        """
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return list(executor.map(
+                lambda article: self._store_article(
+                    *article, self._get_wikipedia_article(*article)
+                ),
+                articles
+            ))
+    
+    def _store_article(self, lang, title, content):
+        """
+        Write an article's text to articles_dir.
+        
+        Args:
+            lang: Language code (e.g., 'en', 'zh')
+            title: Article title
+            content: Article text, or None if it could not be collected
+            
+        Returns:
+            Dictionary with the text file path (relative to output_dir),
+            word_count and char_count, or None if there is no text
+        """
+        if not content:
+            return None
+        
+        slug = re.sub(r'\W+', '_', title).strip('_')
+        path = os.path.join('articles', f"{lang}_{slug}.txt")
+        with open(os.path.join(self.output_dir, path), 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        return {
+            'path': path,
+            'word_count': len(content.split()),
+            'char_count': len(content)
+        }
     
     def _get_wikipedia_article(self, lang, title):
         """
@@ -133,10 +367,7 @@ class DuFuWikipediaCollector:
                 'exsectionformat': 'plain'
             }
             
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._cached_get(base_url, params)
             pages = data.get('query', {}).get('pages', {})
             
             for page_id, page_data in pages.items():
@@ -163,10 +394,7 @@ class DuFuWikipediaCollector:
                 'languages': 'en|zh'
             }
             
-            response = requests.get(self.wikidata_base, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._cached_get(self.wikidata_base, params)
             entity = data.get('entities', {}).get(self.du_fu_qid, {})
             
             # Extract relevant information
@@ -244,47 +472,45 @@ class DuFuWikipediaCollector:
             ('en', "Chang'an", 'Tang Dynasty capital')
         ]
         
-        for lang, title, description in related_topics:
+        stored = self._fetch_articles(
+            [(lang, title) for lang, title, _ in related_topics]
+        )
+        
+        for (lang, title, description), text_info in zip(related_topics, stored):
             print(f"  Collecting: {title} ({description})")
             
-            content = self._get_wikipedia_article(lang, title)
-            
-            if content:
+            if text_info:
                 self.related_articles.append({
                     'language': lang,
                     'title': title,
                     'description': description,
-                    'content': content,
-                    'word_count': len(content.split()),
-                    'char_count': len(content),
+                    **text_info,
                     'collected': datetime.now().isoformat()
                 })
-                print(f"    ✓ Collected: {len(content.split())} words")
+                print(f"    ✓ Collected: {text_info['word_count']} words")
             else:
                 print(f"    ✗ Failed to collect")
-            
-            time.sleep(1)  # Rate limiting
     
     def _save_all_data(self):
         """
         Save all collected data to JSON files.
+        
+        Data files are written as compact JSON; only the collection summary
+        is pretty-printed for reading.
         """
         # Save Wikipedia articles
         wikipedia_file = os.path.join(self.output_dir, 'wikipedia_articles.json')
-        with open(wikipedia_file, 'w', encoding='utf-8') as f:
-            json.dump(self.wikipedia_data, f, ensure_ascii=False, indent=2)
+        _dump_compact(self.wikipedia_data, wikipedia_file)
         print(f"  Saved: wikipedia_articles.json ({len(self.wikipedia_data)} articles)")
         
         # Save Wikidata information
         wikidata_file = os.path.join(self.output_dir, 'wikidata_info.json')
-        with open(wikidata_file, 'w', encoding='utf-8') as f:
-            json.dump(self.wikidata_data, f, ensure_ascii=False, indent=2)
+        _dump_compact(self.wikidata_data, wikidata_file)
         print(f"  Saved: wikidata_info.json")
         
         # Save related articles
         related_file = os.path.join(self.output_dir, 'related_articles.json')
-        with open(related_file, 'w', encoding='utf-8') as f:
-            json.dump(self.related_articles, f, ensure_ascii=False, indent=2)
+        _dump_compact(self.related_articles, related_file)
         print(f"  Saved: related_articles.json ({len(self.related_articles)} articles)")
         
         # Generate collection summary
@@ -325,11 +551,9 @@ def main():
     # Configuration
     output_dir = "/Users/rickiyang/Documents/UTS/36118-Applied Natural Language Processing/AT2/living-voices-dataset/datasets/du_fu/raw_data/wikipedia_supplement"
     
-    # Create collector
-    collector = DuFuWikipediaCollector(output_dir)
-    
-    # Collect all supplementary data
-    collector.collect_all()
+    # Create collector and collect all supplementary data
+    with DuFuWikipediaCollector(output_dir) as collector:
+        collector.collect_all()
 
 
 if __name__ == "__main__":
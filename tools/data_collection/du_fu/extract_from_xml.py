@@ -8,12 +8,49 @@ Author: Living Voices Dataset Project
 Date: 2025-10-04
 """
 
-import xml.etree.ElementTree as ET
+from lxml import etree as ET
 import json
 import csv
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import mmap
 import os
+import re
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Author name matched on every poem in the source file
+DUFU = sys.intern('杜甫')
+DUFU_BYTES = DUFU.encode('utf-8')
+
+# CSV dialect for the poem exports: minimal quoting and plain '\n' row
+# endings (the default excel dialect writes '\r\n')
+csv.register_dialect('dufu_poems', delimiter=',', quotechar='"',
+                     doublequote=True, quoting=csv.QUOTE_MINIMAL,
+                     lineterminator='\n')
+
+
+# Encoder for the CSV JSON columns, built once: json.dumps() with
+# non-default options constructs a new JSONEncoder on every call
+_JSON_COLUMN_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def _dumps(obj):
+    """
+    Serialise a CSV column value to JSON.
+    
+    Output matches json.dumps(obj, ensure_ascii=False), the format of the
+    published CSV (', ' and ': ' separators, non-ASCII preserved).
+    """
+    return _JSON_COLUMN_ENCODER.encode(obj)
 
 
 class DuFuXMLExtractor:
@@ -22,6 +59,34 @@ class DuFuXMLExtractor:
     and processes them for RAG system training.
     """
     
+    # Column order of the structured CSV export
+    CSV_FIELDNAMES = (
+        'poem_id', 'title', 'author', 'author_id', 'dynasty',
+        'creation_date', 'place_code', 'poem_type', 'poem_type_detail',
+        'rhyme_category', 'has_title', 'line_count', 'full_text',
+        'allusions_count', 'source_books_count', 'text_annotations_count',
+        'lines_json', 'allusions_json', 'source_books_json'
+    )
+    
+    # Annotation lists counted by generate_statistics
+    ANNOTATION_FIELDS = (
+        'text_annotations', 'word_dict_annotations',
+        'char_dict_annotations', 'allusion_key_annotations'
+    )
+    
+    # Buffer size for the XML read and CSV writes (fewer read/write calls
+    # than the 8KB default on the 1.7GB source)
+    IO_BUFFER_SIZE = 1024 * 1024
+    
+    # Pending poems per worker process when extracting in a pool; enough to
+    # keep every worker busy while bounding memory and output latency
+    IN_FLIGHT_PER_WORKER = 4
+    
+    # Raw byte patterns used by the mmap pre-scan
+    POEM_START_PATTERN = re.compile(rb'<Poem[\s/>]')
+    DUFU_AUTHOR_ATTR = b' AU="' + DUFU_BYTES + b'"'
+    TAG_NAME_END_BYTES = frozenset(b' \t\r\n/>')
+    
     def __init__(self, xml_file_path, output_dir):
         """
         Initialize the extractor.
@@ -48,9 +113,21 @@ class DuFuXMLExtractor:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
     
-    def extract_all_dufu_poems(self):
+    def extract_all_dufu_poems(self, csv_filename=None, prescan=False, workers=1):
         """
         Main extraction method - iteratively parse XML and extract Du Fu poems.
+        
+        Args:
+            csv_filename: Optional CSV filename; when given, each poem's CSV
+                row is written as soon as the poem is extracted, so disk
+                writes overlap the XML scan instead of a separate
+                save_to_csv() pass at the end
+            prescan: If True, locate Du Fu poems with a byte scan of the
+                memory-mapped file and only parse those poems (see
+                _iter_dufu_poems_prescan); otherwise stream-parse every poem
+            workers: Number of worker processes for per-poem extraction;
+                with more than one, the scan serialises each Du Fu poem and
+                extraction runs in a process pool (results keep file order)
         """
         print("=" * 80)
         print("Du Fu Poetry Extraction from CNKGraph.Writings.xml")
@@ -62,33 +139,52 @@ class DuFuXMLExtractor:
         if not os.path.exists(self.xml_file_path):
             raise FileNotFoundError(f"XML file not found: {self.xml_file_path}")
         
-        print("Starting iterative XML parsing (memory-efficient for 1.7GB file)...")
+        if prescan:
+            print("Starting byte-level pre-scan (only Du Fu poems are parsed)...")
+            dufu_elements = self._iter_dufu_poems_prescan()
+        else:
+            print("Starting iterative XML parsing (memory-efficient for 1.7GB file)...")
+            dufu_elements = self._iter_dufu_poems_iterparse()
         print()
         
-        # Use iterparse for memory-efficient processing
-        context = ET.iterparse(self.xml_file_path, events=("end",))
+        csv_path = None
+        csv_file = None
+        writer = None
+        if csv_filename:
+            csv_path = os.path.join(self.output_dir, csv_filename)
+            csv_file = open(csv_path, 'w', newline='', encoding='utf-8',
+                            buffering=self.IO_BUFFER_SIZE)
+            writer = csv.writer(csv_file, dialect='dufu_poems')
+            writer.writerow(self.CSV_FIELDNAMES)
+        
+        if workers > 1:
+            extracted = self._extract_in_workers(dufu_elements, workers)
+        else:
+            extracted = map(self._extract_poem_data, dufu_elements)
         
-        for event, elem in context:
-            if elem.tag == "Poem":
-                self.stats['total_poems_scanned'] += 1
-                
-                # Check if this is a Du Fu poem
-                author = elem.get('AU', '')
-                if author == '杜甫':
-                    poem_data = self._extract_poem_data(elem)
-                    self.dufu_poems.append(poem_data)
-                    self.stats['dufu_poems_found'] += 1
-                    
-                    # Store author ID
-                    if not self.stats['dufu_author_id']:
-                        self.stats['dufu_author_id'] = elem.get('AId', '')
+        # Loop-invariant method lookups are bound once
+        add_poem = self.dufu_poems.append
+        write_row = writer.writerow if writer is not None else None
+        csv_row = self._csv_row
+        
+        try:
+            for poem_data in extracted:
+                add_poem(poem_data)
                 
-                # Clear processed element to free memory
-                elem.clear()
+                if write_row is not None:
+                    write_row(csv_row(poem_data))
                 
-                # Progress report every 100K poems
-                if self.stats['total_poems_scanned'] % 100000 == 0:
-                    self._print_progress()
+                # Store author ID
+                if not self.stats['dufu_author_id']:
+                    self.stats['dufu_author_id'] = poem_data['author_id']
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+        
+        if csv_path:
+            print()
+            print(f"Saved CSV: {csv_path}")
+            print(f"  Total rows: {self.stats['dufu_poems_found']}")
         
         print()
         print("=" * 80)
@@ -101,7 +197,150 @@ class DuFuXMLExtractor:
         
         return self.dufu_poems
     
-    def _extract_poem_data(self, poem_elem):
+    def _iter_dufu_poems_iterparse(self):
+        """
+        Stream-parse the whole XML file and yield Du Fu Poem elements.
+        
+        Every poem is parsed; elements are cleared after the consumer has
+        handled them, so memory stays flat across the 1.7GB file.
+        
+        Yields:
+            lxml Element for each Du Fu poem
+        """
+        # Use lxml iterparse for memory-efficient processing; the tag filter
+        # is applied inside libxml2 so only Poem end events reach Python, and
+        # comments and processing instructions are dropped by the parser
+        # instead of becoming nodes in each subtree. Whitespace-only text is
+        # kept (remove_blank_text would turn it into None and change the
+        # allusion texts and source book filtering). The file is read
+        # through a large buffer to cut read calls.
+        with open(self.xml_file_path, 'rb',
+                  buffering=self.IO_BUFFER_SIZE) as xml_file:
+            context = ET.iterparse(xml_file, events=("end",),
+                                   tag="Poem", huge_tree=True,
+                                   remove_comments=True, remove_pis=True)
+            
+            # Non-Du Fu poems (the vast majority) only pay for one attribute
+            # read and the cleanup below; the scan counter lives in a local
+            # and is written back to self.stats at progress points
+            scanned = 0
+            
+            for event, elem in context:
+                scanned += 1
+                
+                # Check if this is a Du Fu poem
+                if elem.get('AU') == DUFU:
+                    self.stats['dufu_poems_found'] += 1
+                    yield elem
+                
+                # Clear processed element and drop already-seen siblings so
+                # the root does not keep an ever-growing list of empty Poems
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+                
+                # Progress report every 100K poems
+                if scanned % 100000 == 0:
+                    self.stats['total_poems_scanned'] = scanned
+                    self._print_progress()
+            
+            self.stats['total_poems_scanned'] = scanned
+            del context
+    
+    def _iter_dufu_poems_prescan(self):
+        """
+        Locate Du Fu poems by scanning the raw bytes and parse only those.
+        
+        The file is memory-mapped; poems are counted from their opening
+        tags and each ' AU="杜甫"' attribute is traced back to its enclosing
+        <Poem ...> ... </Poem> byte range, which is then parsed on its own.
+        A poem whose own AU differs (the hit came from a descendant element)
+        is skipped, so the result matches the iterparse path. This relies on
+        the CNKGraph export writing attributes with double quotes and
+        literal (not entity-encoded) UTF-8 text.
+        
+        Raises:
+            ValueError: If a poem's closing tag is missing (truncated file)
+        
+        Yields:
+            lxml Element for each Du Fu poem
+        """
+        with open(self.xml_file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            self.stats['total_poems_scanned'] = sum(
+                1 for _ in self.POEM_START_PATTERN.finditer(mm))
+            print(f"Poems in file: {self.stats['total_poems_scanned']:,}")
+            
+            find = mm.find
+            rfind = mm.rfind
+            author_attr = self.DUFU_AUTHOR_ATTR
+            pos = 0
+            
+            while True:
+                hit = find(author_attr, pos)
+                if hit < 0:
+                    break
+                
+                # Enclosing <Poem> start tag (not e.g. a <Poems> root)
+                start = rfind(b'<Poem', 0, hit)
+                while start >= 0 and mm[start + 5] not in self.TAG_NAME_END_BYTES:
+                    start = rfind(b'<Poem', 0, start)
+                if start < 0:
+                    pos = hit + len(author_attr)
+                    continue
+                
+                tag_end = find(b'>', start)
+                if mm[tag_end - 1] == ord('/'):
+                    end = tag_end + 1
+                else:
+                    close = find(b'</Poem>', tag_end)
+                    if close < 0:
+                        raise ValueError(
+                            f"Truncated XML file: <Poem> at byte {start} has "
+                            f"no closing </Poem> in {self.xml_file_path}")
+                    end = close + len(b'</Poem>')
+                pos = end
+                
+                # The hit may come from a descendant element carrying the
+                # same attribute; only the Poem's own author counts
+                elem = ET.fromstring(mm[start:end])
+                if elem.get('AU') != DUFU:
+                    continue
+                
+                self.stats['dufu_poems_found'] += 1
+                yield elem
+    
+    def _extract_in_workers(self, dufu_elements, workers):
+        """
+        Extract poem data in a process pool while the scan keeps running.
+        
+        Each Du Fu Poem element is serialised and submitted as soon as the
+        scan yields it; results are returned in submission order so the
+        output matches a serial run. At most IN_FLIGHT_PER_WORKER poems per
+        worker are pending at once, so results stream out during the scan
+        instead of piling up until it finishes.
+        
+        Args:
+            dufu_elements: Iterable of Du Fu Poem elements
+            workers: Number of worker processes
+            
+        Yields:
+            Poem data dictionaries in file order
+        """
+        max_in_flight = workers * self.IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = deque()
+            for elem in dufu_elements:
+                futures.append(pool.submit(
+                    _extract_poem_from_bytes,
+                    ET.tostring(elem, encoding='utf-8', with_tail=False)))
+                if len(futures) >= max_in_flight:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+    
+    @staticmethod
+    def _extract_poem_data(poem_elem):
         """
         Extract comprehensive data from a single poem XML element.
         
@@ -113,49 +352,62 @@ class DuFuXMLExtractor:
         """
         poem_data = {}
         
+        # Nearly every Poem attribute is read below, so take them all in one
+        # lxml call and answer the lookups from a plain dict
+        attrs = dict(poem_elem.items())
+        get = attrs.get
+        find = poem_elem.find
+        
         # Basic metadata
-        poem_data['poem_id'] = poem_elem.get('Id', '')
-        poem_data['author'] = poem_elem.get('AU', '')
-        poem_data['author_id'] = poem_elem.get('AId', '')
-        poem_data['dynasty'] = poem_elem.get('D', '')
+        poem_data['poem_id'] = get('Id', '')
+        poem_data['author'] = get('AU', '')
+        poem_data['author_id'] = get('AId', '')
+        poem_data['dynasty'] = get('D', '')
         
         # Temporal information
-        poem_data['creation_date'] = poem_elem.get('AD', '')
-        poem_data['group_number'] = poem_elem.get('G', '')
+        poem_data['creation_date'] = get('AD', '')
+        poem_data['group_number'] = get('G', '')
         
         # Spatial information
-        poem_data['place_code'] = poem_elem.get('AP', '')
+        poem_data['place_code'] = get('AP', '')
         
         # Literary characteristics
-        poem_data['poem_type'] = poem_elem.get('T', '')
-        poem_data['poem_type_detail'] = poem_elem.get('TD', '')
-        poem_data['rhyme_category'] = poem_elem.get('R', '')
-        poem_data['rhyme_number'] = poem_elem.get('RA', '')
-        poem_data['final_rhyme'] = poem_elem.get('FR', '')
-        poem_data['has_title'] = poem_elem.get('TS', '') == 'true'
+        poem_data['poem_type'] = get('T', '')
+        poem_data['poem_type_detail'] = get('TD', '')
+        poem_data['rhyme_category'] = get('R', '')
+        poem_data['rhyme_number'] = get('RA', '')
+        poem_data['final_rhyme'] = get('FR', '')
+        poem_data['has_title'] = get('TS', '') == 'true'
         
         # Title extraction
-        title_elem = poem_elem.find('Title')
+        title_elem = find('Title')
         if title_elem is not None:
             poem_data['title'] = title_elem.get('C', '')
-            poem_data['title_annotations'] = self._extract_annotations(title_elem.find('Ns'))
+            poem_data['title_annotations'] = DuFuXMLExtractor._extract_annotations(
+                title_elem.find('Ns'))
         else:
             poem_data['title'] = ''
             poem_data['title_annotations'] = []
         
         # Content extraction (lines)
-        jus_elem = poem_elem.find('Jus')
+        jus_elem = find('Jus')
         if jus_elem is not None:
             lines = []
             line_tones = []
             line_rhymes = []
             line_annotations = []
+            add_line = lines.append
+            add_tone = line_tones.append
+            add_rhyme = line_rhymes.append
+            add_annotations = line_annotations.append
+            extract_annotations = DuFuXMLExtractor._extract_annotations
             
             for ju in jus_elem.findall('Ju'):
-                lines.append(ju.get('C', ''))
-                line_tones.append(ju.get('T', ''))
-                line_rhymes.append(ju.get('R', ''))
-                line_annotations.append(self._extract_annotations(ju.find('Ns')))
+                ju_get = ju.get
+                add_line(ju_get('C', ''))
+                add_tone(ju_get('T', ''))
+                add_rhyme(ju_get('R', ''))
+                add_annotations(extract_annotations(ju.find('Ns')))
             
             poem_data['lines'] = lines
             poem_data['line_tones'] = line_tones
@@ -168,7 +420,7 @@ class DuFuXMLExtractor:
             poem_data['line_annotations'] = []
         
         # Allusions (典故)
-        as_elem = poem_elem.find('As')
+        as_elem = find('As')
         if as_elem is not None:
             allusions = []
             for a in as_elem.findall('A'):
@@ -183,15 +435,30 @@ class DuFuXMLExtractor:
             poem_data['allusions'] = []
         
         # Source books (文献来源)
-        fs_elem = poem_elem.find('Fs')
+        fs_elem = find('Fs')
         if fs_elem is not None:
             source_books = [f.text for f in fs_elem.findall('F') if f.text]
             poem_data['source_books'] = source_books
         else:
             poem_data['source_books'] = []
         
-        # Extract all annotation types
-        annotations_by_type = self._extract_annotations_by_type(poem_elem)
+        # Annotations by type, in document order: one pass over every N
+        # element in the poem, wherever it is nested
+        annotations_by_type = {
+            'Text': [],
+            'WordDictInJson': [],
+            'CharDictInJson': [],
+            'AllusionKey': [],
+            'Image': []
+        }
+        for n in poem_elem.iter('N'):
+            bucket = annotations_by_type.get(n.get('T', ''))
+            if bucket is not None:
+                bucket.append({
+                    'index': n.get('I', ''),
+                    'content': n.text or ''
+                })
+        
         poem_data['text_annotations'] = annotations_by_type['Text']
         poem_data['word_dict_annotations'] = annotations_by_type['WordDictInJson']
         poem_data['char_dict_annotations'] = annotations_by_type['CharDictInJson']
@@ -199,11 +466,15 @@ class DuFuXMLExtractor:
         poem_data['image_annotations'] = annotations_by_type['Image']
         
         # Sentence indices
-        sis_elem = poem_elem.find('SIs')
+        sis_elem = find('SIs')
         if sis_elem is not None:
             sentence_indices = []
             for si in sis_elem.findall('SI'):
-                indices = [int(i.text) for i in si.findall('int') if i.text and i.text.isdigit()]
+                # Only plain unsigned digit strings are kept; isdecimal()
+                # also excludes digits such as '²' that int() rejects
+                indices = [int(text) for text in
+                           (i.text for i in si.findall('int'))
+                           if text and text.isdecimal()]
                 sentence_indices.append(indices)
             poem_data['sentence_indices'] = sentence_indices
         else:
@@ -211,7 +482,8 @@ class DuFuXMLExtractor:
         
         return poem_data
     
-    def _extract_annotations(self, ns_elem):
+    @staticmethod
+    def _extract_annotations(ns_elem):
         """
         Extract annotations from a Ns (Notes) element.
         
@@ -224,41 +496,11 @@ class DuFuXMLExtractor:
         annotations = []
         if ns_elem is not None:
             for n in ns_elem.findall('N'):
-                annotation = {
+                annotations.append({
                     'type': n.get('T', ''),
                     'index': n.get('I', ''),
                     'content': n.text or ''
-                }
-                annotations.append(annotation)
-        return annotations
-    
-    def _extract_annotations_by_type(self, poem_elem):
-        """
-        Extract all annotations categorized by type.
-        
-        Args:
-            poem_elem: XML Element representing a poem
-            
-        Returns:
-            Dictionary with annotation types as keys
-        """
-        annotations = {
-            'Text': [],
-            'WordDictInJson': [],
-            'CharDictInJson': [],
-            'AllusionKey': [],
-            'Image': []
-        }
-        
-        for n in poem_elem.iter('N'):
-            n_type = n.get('T', '')
-            if n_type in annotations:
-                annotation = {
-                    'index': n.get('I', ''),
-                    'content': n.text or ''
-                }
-                annotations[n_type].append(annotation)
-        
+                })
         return annotations
     
     def _print_progress(self):
@@ -282,7 +524,7 @@ class DuFuXMLExtractor:
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump({
                 'metadata': {
-                    'author': '杜甫',
+                    'author': DUFU,
                     'author_id': self.stats['dufu_author_id'],
                     'total_poems': len(self.dufu_poems),
                     'extraction_date': datetime.now().isoformat(),
@@ -308,41 +550,83 @@ class DuFuXMLExtractor:
             print("Warning: No poems to save")
             return None
         
-        # Prepare rows for CSV (flatten nested structures)
-        csv_rows = []
-        for poem in self.dufu_poems:
-            row = {
-                'poem_id': poem['poem_id'],
-                'title': poem['title'],
-                'author': poem['author'],
-                'author_id': poem['author_id'],
-                'dynasty': poem['dynasty'],
-                'creation_date': poem['creation_date'],
-                'place_code': poem['place_code'],
-                'poem_type': poem['poem_type'],
-                'poem_type_detail': poem['poem_type_detail'],
-                'rhyme_category': poem['rhyme_category'],
-                'has_title': poem['has_title'],
-                'line_count': len(poem['lines']),
-                'full_text': '\n'.join(poem['lines']),
-                'allusions_count': len(poem['allusions']),
-                'source_books_count': len(poem['source_books']),
-                'text_annotations_count': len(poem['text_annotations']),
-                'lines_json': json.dumps(poem['lines'], ensure_ascii=False),
-                'allusions_json': json.dumps(poem['allusions'], ensure_ascii=False),
-                'source_books_json': json.dumps(poem['source_books'], ensure_ascii=False)
-            }
-            csv_rows.append(row)
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=csv_rows[0].keys())
-            writer.writeheader()
-            writer.writerows(csv_rows)
+        # Rows are built lazily so the JSON columns of a poem are only
+        # serialised while that row is being written
+        with open(output_path, 'w', newline='', encoding='utf-8',
+                  buffering=self.IO_BUFFER_SIZE) as f:
+            writer = csv.writer(f, dialect='dufu_poems')
+            writer.writerow(self.CSV_FIELDNAMES)
+            writer.writerows(self._csv_row(poem) for poem in self.dufu_poems)
         
         print(f"Saved CSV: {output_path}")
-        print(f"  Total rows: {len(csv_rows)}")
+        print(f"  Total rows: {len(self.dufu_poems)}")
+        return output_path
+    
+    def save_to_parquet(self, filename='dufu_poems_structured.parquet'):
+        """
+        Save extracted poems to a zstd-compressed Parquet file.
+        
+        Columns match the structured CSV. Requires pyarrow; when it is
+        not installed a warning is printed and nothing is written.
+        
+        Args:
+            filename: Output Parquet filename
+        """
+        if pa is None:
+            print("Warning: pyarrow is not installed, skipping Parquet output")
+            return None
+        
+        output_path = os.path.join(self.output_dir, filename)
+        
+        if not self.dufu_poems:
+            print("Warning: No poems to save")
+            return None
+        
+        columns = zip(*(self._csv_row(poem) for poem in self.dufu_poems))
+        table = pa.Table.from_arrays([pa.array(column) for column in columns],
+                                     names=list(self.CSV_FIELDNAMES))
+        pq.write_table(table, output_path, compression='zstd')
+        
+        print(f"Saved Parquet: {output_path}")
+        print(f"  Total rows: {table.num_rows}")
         return output_path
     
+    def _csv_row(self, poem):
+        """
+        Flatten a poem dictionary into a CSV row.
+        
+        Rows are plain tuples in CSV_FIELDNAMES order so they can go
+        straight to csv.writer without DictWriter's per-row key mapping.
+        
+        Args:
+            poem: Poem dictionary produced by _extract_poem_data
+            
+        Returns:
+            Tuple of column values in CSV_FIELDNAMES order
+        """
+        lines = poem['lines']
+        return (
+            poem['poem_id'],
+            poem['title'],
+            poem['author'],
+            poem['author_id'],
+            poem['dynasty'],
+            poem['creation_date'],
+            poem['place_code'],
+            poem['poem_type'],
+            poem['poem_type_detail'],
+            poem['rhyme_category'],
+            poem['has_title'],
+            len(lines),
+            '\n'.join(lines),
+            len(poem['allusions']),
+            len(poem['source_books']),
+            len(poem['text_annotations']),
+            _dumps(lines),
+            _dumps(poem['allusions']),
+            _dumps(poem['source_books'])
+        )
+    
     def generate_statistics(self):
         """
         Generate comprehensive statistics about extracted poems.
@@ -353,22 +637,31 @@ class DuFuXMLExtractor:
         if not self.dufu_poems:
             return {}
         
+        # Category tallies are defaultdict(int) counters bound to locals,
+        # the cheapest per-item increment for the loop below
+        creation_dates = defaultdict(int)
+        places = defaultdict(int)
+        poem_types = defaultdict(int)
+        poem_type_details = defaultdict(int)
+        rhyme_categories = defaultdict(int)
+        annotation_types = defaultdict(int)
+        
         stats = {
             'total_poems': len(self.dufu_poems),
             'author_id': self.stats['dufu_author_id'],
             
             # Temporal analysis
-            'creation_dates': defaultdict(int),
+            'creation_dates': creation_dates,
             'date_range': {'earliest': None, 'latest': None},
             
             # Spatial analysis
-            'places': defaultdict(int),
-            'unique_places': set(),
+            'places': places,
+            'unique_places': 0,
             
             # Literary analysis
-            'poem_types': defaultdict(int),
-            'poem_type_details': defaultdict(int),
-            'rhyme_categories': defaultdict(int),
+            'poem_types': poem_types,
+            'poem_type_details': poem_type_details,
+            'rhyme_categories': rhyme_categories,
             
             # Content analysis
             'total_lines': 0,
@@ -380,61 +673,79 @@ class DuFuXMLExtractor:
             # Annotation analysis
             'total_allusions': 0,
             'total_source_books': 0,
-            'annotation_types': defaultdict(int)
+            'annotation_types': annotation_types
         }
         
+        # Running totals are kept in locals and stored once after the loop;
+        # each poem field is looked up once
+        total_lines = 0
+        poems_with_title = 0
+        poems_with_allusions = 0
+        poems_with_sources = 0
+        poems_with_annotations = 0
+        total_allusions = 0
+        total_source_books = 0
+        annotation_fields = self.ANNOTATION_FIELDS
+        
         for poem in self.dufu_poems:
             # Temporal
-            if poem['creation_date']:
-                stats['creation_dates'][poem['creation_date']] += 1
-                if not stats['date_range']['earliest'] or poem['creation_date'] < stats['date_range']['earliest']:
-                    stats['date_range']['earliest'] = poem['creation_date']
-                if not stats['date_range']['latest'] or poem['creation_date'] > stats['date_range']['latest']:
-                    stats['date_range']['latest'] = poem['creation_date']
+            if creation_date := poem['creation_date']:
+                creation_dates[creation_date] += 1
             
             # Spatial
-            if poem['place_code']:
-                stats['places'][poem['place_code']] += 1
-                stats['unique_places'].add(poem['place_code'])
+            if place_code := poem['place_code']:
+                places[place_code] += 1
             
             # Literary
-            if poem['poem_type']:
-                stats['poem_types'][poem['poem_type']] += 1
-            if poem['poem_type_detail']:
-                stats['poem_type_details'][poem['poem_type_detail']] += 1
-            if poem['rhyme_category']:
-                stats['rhyme_categories'][poem['rhyme_category']] += 1
+            if poem_type := poem['poem_type']:
+                poem_types[poem_type] += 1
+            if poem_type_detail := poem['poem_type_detail']:
+                poem_type_details[poem_type_detail] += 1
+            if rhyme_category := poem['rhyme_category']:
+                rhyme_categories[rhyme_category] += 1
             
             # Content
-            stats['total_lines'] += len(poem['lines'])
+            total_lines += len(poem['lines'])
             if poem['has_title']:
-                stats['poems_with_title'] += 1
-            if poem['allusions']:
-                stats['poems_with_allusions'] += 1
-                stats['total_allusions'] += len(poem['allusions'])
-            if poem['source_books']:
-                stats['poems_with_sources'] += 1
-                stats['total_source_books'] += len(poem['source_books'])
+                poems_with_title += 1
+            if allusions := poem['allusions']:
+                poems_with_allusions += 1
+                total_allusions += len(allusions)
+            if source_books := poem['source_books']:
+                poems_with_sources += 1
+                total_source_books += len(source_books)
             
             # Annotations
-            annotation_types = ['text_annotations', 'word_dict_annotations', 
-                              'char_dict_annotations', 'allusion_key_annotations']
             has_annotations = False
-            for ann_type in annotation_types:
-                if poem[ann_type]:
+            for ann_type in annotation_fields:
+                if annotations := poem[ann_type]:
                     has_annotations = True
-                    stats['annotation_types'][ann_type] += len(poem[ann_type])
+                    annotation_types[ann_type] += len(annotations)
             if has_annotations:
-                stats['poems_with_annotations'] += 1
-        
-        # Convert sets and defaultdicts to regular dicts for JSON serialization
-        stats['unique_places'] = len(stats['unique_places'])
-        stats['creation_dates'] = dict(stats['creation_dates'])
-        stats['places'] = dict(stats['places'])
-        stats['poem_types'] = dict(stats['poem_types'])
-        stats['poem_type_details'] = dict(stats['poem_type_details'])
-        stats['rhyme_categories'] = dict(stats['rhyme_categories'])
-        stats['annotation_types'] = dict(stats['annotation_types'])
+                poems_with_annotations += 1
+        
+        stats['total_lines'] = total_lines
+        stats['poems_with_title'] = poems_with_title
+        stats['poems_with_allusions'] = poems_with_allusions
+        stats['poems_with_sources'] = poems_with_sources
+        stats['poems_with_annotations'] = poems_with_annotations
+        stats['total_allusions'] = total_allusions
+        stats['total_source_books'] = total_source_books
+        
+        # Date range from the distinct dates rather than per-poem compares
+        if creation_dates:
+            stats['date_range']['earliest'] = min(creation_dates)
+            stats['date_range']['latest'] = max(creation_dates)
+        
+        # Convert defaultdicts to regular dicts for JSON serialization;
+        # the distinct place count is the number of place_code keys
+        stats['unique_places'] = len(places)
+        stats['creation_dates'] = dict(creation_dates)
+        stats['places'] = dict(places)
+        stats['poem_types'] = dict(poem_types)
+        stats['poem_type_details'] = dict(poem_type_details)
+        stats['rhyme_categories'] = dict(rhyme_categories)
+        stats['annotation_types'] = dict(annotation_types)
         
         # Calculate averages
         stats['average_lines_per_poem'] = stats['total_lines'] / len(self.dufu_poems)
@@ -484,6 +795,19 @@ class DuFuXMLExtractor:
         print("=" * 80)
 
 
+def _extract_poem_from_bytes(poem_xml):
+    """
+    Process-pool entry point: parse one serialised Poem and extract it.
+    
+    Args:
+        poem_xml: UTF-8 bytes of a single <Poem> element
+        
+    Returns:
+        Dictionary containing all poem data
+    """
+    return DuFuXMLExtractor._extract_poem_data(ET.fromstring(poem_xml))
+
+
 def main():
     """Main execution function."""
     
@@ -494,8 +818,9 @@ def main():
     # Create extractor
     extractor = DuFuXMLExtractor(xml_file, output_dir)
     
-    # Extract poems
-    poems = extractor.extract_all_dufu_poems()
+    # Extract poems (the structured CSV is written while scanning)
+    poems = extractor.extract_all_dufu_poems(csv_filename='dufu_poems_structured.csv',
+                                             workers=os.cpu_count() or 1)
     
     if not poems:
         print("Error: No Du Fu poems were extracted!")
@@ -505,7 +830,7 @@ def main():
     print()
     print("Saving extracted data...")
     extractor.save_to_json()
-    extractor.save_to_csv()
+    extractor.save_to_parquet()
     extractor.save_statistics()
     
     print()